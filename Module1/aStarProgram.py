@@ -1,29 +1,108 @@
+from collections import deque
+
+from Module1.frontier import HeapFrontier, ListFrontier, FifoFrontier, LifoFrontier
+from Module1.checkpoint import NEW, UPDATE, CLOSE, KIDS
 
 # A* algorithm, fairly similar to the psudocode
+# With quiet=True nothing is printed, for engines built on top of this one
+# frontier is a new open list from Module1.frontier, e.g. BucketFrontier(), and takes the place of pop
+# consistent=True declares that h(node) <= arcCost(node, kid) + h(kid) for every arc, like Manhattan distance
+# with unit arcs. Then a node has its best g when it is closed, so closed nodes are never opened again:
+# only their keys are kept, and better paths are not propagated. The claim is checked with assert
+# checkpoint is a SearchCheckpoint from Module1.checkpoint. If its file already holds a checkpoint of this
+# search, the search goes on from there, else a new one is started. Same callbacks and initialState both times
 def aStarAlgorithm(getNeighbours,
                    h_func,
                    initialState,
                    paint,
                    pop=None,
-                   arcCost=None):
+                   arcCost=None,
+                   stats=None,
+                   quiet=False,
+                   frontier=None,
+                   consistent=False,
+                   checkpoint=None):
 
-    # Default method from the psudocode
+    # Default method from the psudocode, with a worklist instead of recursion
+    # Only the kids stored when the nodes were expanded are visited, so the work stays within the
+    # subtree that gets a better path. Returns the number of nodes that got a better path
     def propagateBetterPath(node):
-        possibleKids = getNeighbours(node)
-        for kid in possibleKids:
-            if node == kid.parent:
-                kid.g = kid.parent.g + arcCost(node, kid)
-                propagateBetterPath(kid)
+        numberOfNodesRepropagated = 0
+        worklist = deque([node])
+        while worklist:
+            node = worklist.popleft()
+            for kid in kids[id(node)]:
+                if node.g + arcCost(node, kid) < kid.g:
+                    kid.parent = node
+                    kid.g = node.g + arcCost(node, kid)
+                    numberOfNodesRepropagated += 1
+                    if checkpoint is not None:
+                        checkpoint.updateNode(kid)
+                    # Only expanded nodes have kids to pass the better path on to
+                    if id(kid) in kids:
+                        worklist.append(kid)
+                    else:
+                        open.update(kid)
+        return numberOfNodesRepropagated
+
+    # Plays the events of the checkpoint back, the pops must come out the same as when it was written
+    # Returns the states in id order, and the last state closed
+    def replayCheckpoint(events):
+        states = [startNode]
+        lastClosed = None
+        for event in events:
+            kind = event[0]
+            if kind == NEW:
+                node = checkpoint.decode(event[2])
+                node.g = event[3]
+                node.h = event[4]
+                node.parent = states[event[5]]
+                states.append(node)
+                open.push(node)
+                openIndex[node.key()] = node
+            elif kind == UPDATE:
+                node = states[event[1]]
+                node.g = event[2]
+                node.parent = states[event[3]]
+                if node.key() in openIndex:
+                    open.update(node)
+            elif kind == CLOSE:
+                node = open.pop()
+                if node is not states[event[1]]:
+                    raise ValueError(checkpoint.path + " is a checkpoint of another search")
+                del openIndex[node.key()]
+                if consistent:
+                    closedIndex.add(node.key())
+                else:
+                    closedIndex[node.key()] = node
+                lastClosed = node
+            elif kind == KIDS:
+                kids[id(states[event[1]])] = [states[kidId] for kidId in event[2]]
+        return states, lastClosed
 
     # If custom functions are not defined, go default
-    if pop is None:
-        pop = standardPop
+    # Without a custom pop the open list is a binary heap
+    # The pops for breadth and depth first search get a deque and a stack instead of a plain list
     if arcCost is None:
-        def arcCost(node1, node2):
-            return 1
+        arcCost = unitArcCost
 
-    open = []
-    closed = []
+    if frontier is not None:
+        open = frontier
+    elif pop is None:
+        open = HeapFrontier()
+    elif pop is breadthFirstPop:
+        open = FifoFrontier()
+    elif pop is depthFirstPop:
+        open = LifoFrontier()
+    else:
+        open = ListFrontier(pop)
+
+    # The stored copy of every open and closed state, by key
+    # In consistent mode closedIndex only holds the keys
+    openIndex = {}
+    closedIndex = set() if consistent else {}
+    # The stored copies of the kids of every expanded node, by id of the node
+    kids = {}
 
     startNode = initialState
     startNode.g = 0
@@ -32,57 +111,174 @@ def aStarAlgorithm(getNeighbours,
     # Counters to display at the end
     numberOfNodesGenerated = 1
     numberOfNodesExpanded = 0
+    numberOfNodesRepropagated = 0
+
+    open.push(startNode)
+    openIndex[startNode.key()] = startNode
+    currentTile = startNode
+
+    # The file is closed even if a callback raises, the chunks already written stay usable
+    try:
+        if checkpoint is not None:
+            saved = checkpoint.load()
+            states = [startNode]
+            if saved is not None:
+                events, counters = saved
+                states, lastClosed = replayCheckpoint(events)
+                numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesRepropagated = counters
+                # The search had already ended on this goal
+                if lastClosed is not None and lastClosed.isGoal():
+                    numberOfNodesInSolutionPath = getSolutionPathLength(lastClosed)
+                    if not quiet:
+                        printSearchStats("A*", numberOfNodesGenerated, numberOfNodesExpanded,
+                                         numberOfNodesInSolutionPath, numberOfNodesRepropagated)
+                    saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath,
+                                    numberOfNodesRepropagated)
+                    return lastClosed
+            checkpoint.start(states)
+            del states
+
+        redrawCounter = 0
+
+        while True:
+            if checkpoint is not None:
+                checkpoint.tick((numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesRepropagated))
+
+            if len(open) == 0:
+                if checkpoint is not None:
+                    checkpoint.close((numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesRepropagated))
+                if not quiet:
+                    print("No goal found")
+                saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, None, numberOfNodesRepropagated)
+                return currentTile
 
-    open.append(startNode)
+            currentTile = open.pop()
+            numberOfNodesExpanded = numberOfNodesExpanded + 1
 
-    redrawCounter = 0
+            paint(currentTile)
 
-    while True:
-        if len(open) == 0:
-            print("No goal found")
-            return currentTile
+            del openIndex[currentTile.key()]
+            if consistent:
+                closedIndex.add(currentTile.key())
+            else:
+                closedIndex[currentTile.key()] = currentTile
+            if checkpoint is not None:
+                checkpoint.closeNode(currentTile)
 
-        currentTile = pop(open) #open.pop()
-        numberOfNodesExpanded = numberOfNodesExpanded + 1
+            if currentTile.isGoal():
+                if checkpoint is not None:
+                    checkpoint.close((numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesRepropagated))
+                numberOfNodesInSolutionPath = getSolutionPathLength(currentTile)
+                if not quiet:
+                    printSearchStats("A*", numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath,
+                                     numberOfNodesRepropagated)
+                saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath,
+                                numberOfNodesRepropagated)
+                return currentTile
 
-        paint(currentTile)
+            succ = getNeighbours(currentTile)
 
-        closed.append(currentTile)
+            if consistent:
+                for kid in succ:
+                    key = kid.key()
+                    if key in closedIndex:
+                        continue
+                    kidG = currentTile.g + arcCost(currentTile, kid)
+                    storedKid = openIndex.get(key)
 
-        if currentTile.isGoal():
+                    #First time node is visited
+                    if storedKid is None:
+                        kid.parent = currentTile
+                        kid.g = kidG
+                        kid.h = h_func(kid)
+                        assert currentTile.h <= arcCost(currentTile, kid) + kid.h, "h is not consistent"
+                        open.push(kid)
+                        openIndex[key] = kid
+                        numberOfNodesGenerated += 1
+                        if checkpoint is not None:
+                            checkpoint.addNode(kid)
+                    elif kidG < storedKid.g:
+                        storedKid.parent = currentTile
+                        storedKid.g = kidG
+                        open.update(storedKid)
+                        if checkpoint is not None:
+                            checkpoint.updateNode(storedKid)
+                continue
 
-            numberOfNodesInSolutionPath = 1
-            t = currentTile
-            while t.parent is not None:
-                numberOfNodesInSolutionPath = numberOfNodesInSolutionPath + 1
-                t = t.parent
+            currentKids = kids[id(currentTile)] = []
 
-            print("")
-            print("A* finished")
-            print("Total number of search nodes generated: ", numberOfNodesGenerated)
-            print("Total number of search nodes expanded: ", numberOfNodesExpanded)
-            print("Total number of search nodes on the path from the root to the solution state.: ", numberOfNodesInSolutionPath)
+            for kid in succ:
+                key = kid.key()
+                storedKid = openIndex.get(key)
+                if storedKid is None:
+                    storedKid = closedIndex.get(key)
 
-            return currentTile
+                #First time node is visited
+                if storedKid is None:
+                    kid.parent = currentTile
+                    kid.g = currentTile.g + arcCost(currentTile, kid)
+                    kid.h = h_func(kid)
+                    open.push(kid)
+                    openIndex[key] = kid
+                    numberOfNodesGenerated += 1
+                    currentKids.append(kid)
+                    if checkpoint is not None:
+                        checkpoint.addNode(kid)
+                    continue
 
-        succ = getNeighbours(currentTile)
+                currentKids.append(storedKid)
 
-        for kid in succ:
-            #First time node is visited
-            if kid not in open and kid not in closed:
-                kid.parent = currentTile
-                kid.g = currentTile.g + arcCost(currentTile, kid)
-                kid.h = h_func(kid)
-                open.append(kid)
-                numberOfNodesGenerated += 1
+                # Already seen, but a better path is found. Update the stored copy
+                if currentTile.g + arcCost(currentTile, storedKid) < storedKid.g:
+                    storedKid.parent = currentTile
+                    storedKid.g = currentTile.g + arcCost(currentTile, storedKid)
+                    if checkpoint is not None:
+                        checkpoint.updateNode(storedKid)
+                    if key in closedIndex:
+                        numberOfNodesRepropagated += propagateBetterPath(storedKid)
+                    else:
+                        open.update(storedKid)
 
-            elif currentTile.g + arcCost(currentTile, kid) < kid.g:
-                kid.parent = currentTile
-                kid.g = currentTile.g + arcCost(currentTile, kid)
-                if kid in closed:
-                    propagateBetterPath(kid)
+            if checkpoint is not None:
+                checkpoint.setKids(currentTile, currentKids)
+    finally:
+        if checkpoint is not None:
+            checkpoint.abandon()
 
-# Pops the best element from the open list
+# Number of nodes on the path from the root to this node
+def getSolutionPathLength(node):
+    numberOfNodesInSolutionPath = 1
+    while node.parent is not None:
+        numberOfNodesInSolutionPath = numberOfNodesInSolutionPath + 1
+        node = node.parent
+    return numberOfNodesInSolutionPath
+
+# The counters displayed at the end of a search
+# Engines that never re-propagate leave numberOfNodesRepropagated out
+def printSearchStats(name, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath,
+                     numberOfNodesRepropagated=None):
+    print("")
+    print(name + " finished")
+    print("Total number of search nodes generated: ", numberOfNodesGenerated)
+    print("Total number of search nodes expanded: ", numberOfNodesExpanded)
+    if numberOfNodesRepropagated is not None:
+        print("Total number of search nodes re-propagated: ", numberOfNodesRepropagated)
+    print("Total number of search nodes on the path from the root to the solution state.: ", numberOfNodesInSolutionPath)
+
+# Same counters for callers that want them as data, e.g. batchProgram
+# stats is a dict given by the caller, or None. numberOfNodesInSolutionPath is None if no goal was found
+def saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath,
+                    numberOfNodesRepropagated=None):
+    if stats is None:
+        return
+    stats["generated"] = numberOfNodesGenerated
+    stats["expanded"] = numberOfNodesExpanded
+    stats["pathLength"] = numberOfNodesInSolutionPath
+    if numberOfNodesRepropagated is not None:
+        stats["repropagated"] = numberOfNodesRepropagated
+
+# Pops the best element from a plain open list
+# Linear scan, only used when given as a custom pop
 def standardPop(open):
     bestNode = None
     bestCost = float("inf")
@@ -96,3 +292,23 @@ def standardPop(open):
     open.remove(bestNode)
     # print("Bestnode has f=", bestCost)
     return bestNode
+
+# Custom pop for depth first search
+def depthFirstPop(open):
+    return open.pop()
+
+# Custom pop for breadth first search
+def breadthFirstPop(open):
+    return open.pop(0)
+
+# Heuristic for the uninformed searches
+def zeroHeuristic(node):
+    return 0
+
+# Cost of every move when no arcCost is given
+def unitArcCost(node1, node2):
+    return 1
+
+# Paint callback for runs without a window
+def noPaint(node):
+    pass
@@ -0,0 +1,153 @@
+from time import perf_counter
+
+from Module1.frontier import HeapFrontier
+from Module1.aStarProgram import getSolutionPathLength, printSearchStats, saveSearchStats, unitArcCost
+
+# Anytime repairing A* (ARA*), with the same getNeighbours, h_func and arcCost callbacks as aStarAlgorithm
+#
+# The first search orders the open list on g + weight*h with a large weight, which finds a path quickly
+# but maybe not the shortest one. Then the weight is lowered step by step, and every new search goes on
+# from the open list of the last one instead of starting over. Within one search a node is expanded at
+# most once, states that get a better path after they were closed wait in a list of inconsistent states
+# until the next search.
+#
+# After every search the best goal so far is at most bound times the optimal cost, where
+# bound = min(weight, g(goal) / lowest g + h on the open and inconsistent lists)
+# onSolution(goalNode, bound) is called every time the goal or the bound gets better.
+# The goal node is the stored copy, later searches can still give it a better parent
+
+
+# Stops after timeBudget seconds, or when the bound is down to targetBound (1 means optimal)
+# Returns the best goal found, or initialState if there was none
+def araStarAlgorithm(getNeighbours,
+                     h_func,
+                     initialState,
+                     paint,
+                     arcCost=None,
+                     initialWeight=3.0,
+                     weightStep=0.5,
+                     timeBudget=None,
+                     targetBound=1.0,
+                     onSolution=None,
+                     stats=None,
+                     quiet=False):
+
+    if arcCost is None:
+        arcCost = unitArcCost
+
+    startTime = perf_counter()
+
+    initialState.g = 0
+    initialState.h = h_func(initialState)
+    initialState.parent = None
+
+    # The stored copy of every state seen, by key
+    stored = {initialState.key(): initialState}
+
+    weight = max(initialWeight, 1)
+    open = HeapFrontier(weight)
+    open.push(initialState)
+    openIndex = {initialState.key(): initialState}
+    inconsistent = {}
+
+    goalNode = initialState if initialState.isGoal() else None
+    bound = float("inf")
+    reportedCost = float("inf")
+    outOfTime = False
+
+    # Counters to display at the end
+    numberOfNodesGenerated = 1
+    numberOfNodesExpanded = 0
+
+    while True:
+        closed = set()
+
+        # Expand until no node on the open list can lead to a better goal with this weight
+        while len(open) > 0 and (goalNode is None or goalNode.g > open.getMinimumF()):
+            if timeBudget is not None and perf_counter() - startTime >= timeBudget:
+                outOfTime = True
+                break
+
+            currentTile = open.pop()
+            key = currentTile.key()
+            del openIndex[key]
+            closed.add(key)
+            numberOfNodesExpanded = numberOfNodesExpanded + 1
+            paint(currentTile)
+
+            # Goals are not expanded, all that matters is their g
+            if currentTile.isGoal():
+                continue
+
+            for kid in getNeighbours(currentTile):
+                key = kid.key()
+                storedKid = stored.get(key)
+
+                # First time the state is seen
+                if storedKid is None:
+                    kid.parent = currentTile
+                    kid.g = currentTile.g + arcCost(currentTile, kid)
+                    kid.h = h_func(kid)
+                    stored[key] = kid
+                    numberOfNodesGenerated += 1
+                    storedKid = kid
+                elif currentTile.g + arcCost(currentTile, storedKid) < storedKid.g:
+                    storedKid.parent = currentTile
+                    storedKid.g = currentTile.g + arcCost(currentTile, storedKid)
+                else:
+                    continue
+
+                if storedKid.isGoal() and (goalNode is None or storedKid.g < goalNode.g):
+                    goalNode = storedKid
+
+                if key in closed:
+                    inconsistent[key] = storedKid
+                elif key in openIndex:
+                    open.update(storedKid)
+                else:
+                    open.push(storedKid)
+                    openIndex[key] = storedKid
+
+        # A search that ran out of time proves nothing new
+        if outOfTime or goalNode is None:
+            break
+
+        lowestF = float("inf")
+        for node in list(openIndex.values()) + list(inconsistent.values()):
+            lowestF = min(lowestF, node.g + node.h)
+        if lowestF == float("inf") or goalNode.g <= lowestF:
+            newBound = 1.0
+        else:
+            newBound = min(weight, goalNode.g / lowestF)
+
+        if newBound < bound or goalNode.g < reportedCost:
+            bound = min(bound, newBound)
+            reportedCost = goalNode.g
+            if onSolution is not None:
+                onSolution(goalNode, bound)
+
+        if bound <= max(targetBound, 1.0) or (len(open) == 0 and len(inconsistent) == 0):
+            break
+
+        # Next search: lower weight, and the inconsistent states go back on the open list
+        weight = max(1.0, weight - weightStep)
+        open = HeapFrontier(weight)
+        for key, node in list(openIndex.items()) + list(inconsistent.items()):
+            open.push(node)
+            openIndex[key] = node
+        inconsistent = {}
+
+    if goalNode is None:
+        if not quiet:
+            print("No goal found")
+        saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, None)
+        return initialState
+
+    numberOfNodesInSolutionPath = getSolutionPathLength(goalNode)
+    if not quiet:
+        printSearchStats("ARA*", numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+        print("Suboptimality bound: ", bound)
+    saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+    if stats is not None:
+        stats["bound"] = bound
+    return goalNode
@@ -0,0 +1,123 @@
+import argparse
+import contextlib
+import csv
+import io
+import os
+import sys
+from multiprocessing import Pool
+from time import perf_counter
+
+from Module1 import board
+from Module1.node import Node
+from Module1.aStarProgram import aStarAlgorithm, zeroHeuristic, noPaint
+from Module1.gridSearch import gridAStar
+from Module1.jumpPointSearch import jpsAStar
+from Module1.bidirectionalProgram import bidirectionalGridAStar
+from Module1.wavefront import wavefrontBFS
+from Module1.landmarks import loadLandmarks, altHeuristic
+from Module1.hierarchical import hpaAStar
+from Module1.visibilityGraph import visibilityGraphAStar
+from Module1.contractionHierarchy import loadContractionHierarchy, contractionHierarchySearch
+from Module1.anytimeProgram import araStarAlgorithm
+from Module1.dStarLite import dStarLiteSearch
+from Module1.frontier import BucketFrontier, LifoFrontier
+
+# Runs many navigation maps without a window, for benchmarking and batch solving
+# Usage: python -m Module1.batchProgram Module1/navig1.txt Module1/0.txt ... [--modes astar,bfs] [--output results.csv]
+
+possibleModes = ["astar", "bfs", "dfs", "grid", "jps", "bidirectional", "alt", "hpa", "visibility", "ch", "ara", "dstar"]
+
+resultFields = ["map", "mode", "found", "pathLength", "generated", "expanded", "repropagated", "seconds"]
+
+
+# Runs one mode on the board that is loaded, the map path is where alt and ch keep their tables
+def runMode(mode, path, stats):
+    if mode == "grid":
+        gridAStar(board.manhattenDistToGoalNode, noPaint, stats=stats)
+    elif mode == "jps":
+        jpsAStar(board.manhattenDistToGoalNode, noPaint, stats=stats)
+    elif mode == "bidirectional":
+        bidirectionalGridAStar(board.getSurroundingTiles, noPaint, stats=stats)
+    elif mode == "hpa":
+        hpaAStar(noPaint, stats=stats)
+    elif mode == "visibility":
+        visibilityGraphAStar(noPaint, stats=stats)
+    elif mode == "ch":
+        contractionHierarchySearch(loadContractionHierarchy(path), noPaint, stats=stats)
+    elif mode == "ara":
+        araStarAlgorithm(board.getSurroundingTiles, board.manhattenDistToGoalNode, Node.startNode, noPaint,
+                         stats=stats)
+    elif mode == "dstar":
+        dStarLiteSearch(noPaint, stats=stats)
+    elif mode == "alt":
+        aStarAlgorithm(board.getSurroundingTiles, altHeuristic(loadLandmarks(path)), Node.startNode, noPaint,
+                       stats=stats, consistent=True)
+    elif mode == "bfs":
+        wavefrontBFS(noPaint, stats=stats)
+    elif mode == "dfs":
+        aStarAlgorithm(board.getSurroundingTiles, zeroHeuristic, Node.startNode, noPaint,
+                       stats=stats, frontier=LifoFrontier())
+    else:
+        aStarAlgorithm(board.getSurroundingTiles, board.manhattenDistToGoalNode, Node.startNode, noPaint,
+                       stats=stats, frontier=BucketFrontier(), consistent=True)
+
+
+# Solves one map with one mode, in a worker process
+# The search counters are returned as a row of resultFields
+def runMap(task):
+    path, mode = task
+
+    with open(path, 'r') as f:
+        board.loadBoard(f, headless=True)
+
+    stats = {}
+    # The engines print their counters, those are already in the row
+    with contextlib.redirect_stdout(io.StringIO()):
+        startTime = perf_counter()
+        runMode(mode, path, stats)
+        seconds = perf_counter() - startTime
+
+    return {"map": path,
+            "mode": mode,
+            "found": stats["pathLength"] is not None,
+            "pathLength": stats["pathLength"],
+            "generated": stats["generated"],
+            "expanded": stats["expanded"],
+            "repropagated": stats.get("repropagated"),
+            "seconds": round(seconds, 6)}
+
+
+# Runs every mode on every map in a process pool, and writes one csv row per run
+def runBatch(paths, modes, output, processes=None):
+    tasks = [(path, mode) for path in paths for mode in modes]
+
+    writer = csv.DictWriter(output, fieldnames=resultFields)
+    writer.writeheader()
+    with Pool(processes) as pool:
+        for row in pool.imap(runMap, tasks):
+            writer.writerow(row)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Solve navigation maps without a window")
+    parser.add_argument("maps", nargs="+", help="map files, same format as navig1.txt")
+    parser.add_argument("--modes", default="astar,bfs,dfs",
+                        help="comma separated, one or more of " + ", ".join(possibleModes))
+    parser.add_argument("--output", default=None, help="csv file, default is stdout")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="number of worker processes")
+    arguments = parser.parse_args(arguments)
+
+    modes = arguments.modes.lower().split(",")
+    for mode in modes:
+        if mode not in possibleModes:
+            parser.error("Unknown mode " + mode)
+
+    if arguments.output is None:
+        runBatch(arguments.maps, modes, sys.stdout, arguments.processes)
+    else:
+        with open(arguments.output, 'w', newline='') as output:
+            runBatch(arguments.maps, modes, output, arguments.processes)
+
+
+if __name__ == "__main__":
+    main()
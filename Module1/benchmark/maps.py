@@ -0,0 +1,182 @@
+import os
+
+import numpy as np
+
+from Module1 import board
+from Module1.wavefront import UNREACHABLE, getDistanceMap, getWalkableCells
+
+# Maps and scenarios for the benchmark
+#
+# Maps come in two formats:
+# - navig, the format of navig1.txt: "width height", "startX startY goalX goalY", then one
+#   "x y width height" obstacle per line. The start and goal of the file are the only scenario
+# - MovingAI (.map): "type octile", "height h", "width w", "map", then one line of characters per row.
+#   '.', 'G' and 'S' are free cells, everything else is an obstacle. Column c is x = c, row r is y = r
+#
+# Scenario files (.scen) list start and goal pairs on a map in the MovingAI format:
+# "version 1", then "bucket map mapWidth mapHeight startX startY goalX goalY optimalLength" per line.
+# The map may be in either format. MovingAI lengths are for 8-connected moves, so the optimal length
+# is always computed again for the 4-connected board, with a wavefront from the start
+
+freeSymbols = ".GS"
+
+
+class GridMap:
+
+    def __init__(self, path, width, height, rectangles, start=None, goal=None):
+        self.path = path
+        self.width = width
+        self.height = height
+        # Obstacles as "x y width height" rectangles, the way createObstacle takes them
+        self.rectangles = rectangles
+        self.start = start
+        self.goal = goal
+
+
+class Scenario:
+
+    def __init__(self, gridMap, start, goal):
+        self.gridMap = gridMap
+        self.start = start
+        self.goal = goal
+        # Number of moves on a shortest path, None if the goal can not be reached
+        # Computed by setupBoard the first time the scenario is run
+        self.optimalLength = UNREACHABLE
+
+
+def readNavigMap(path):
+    with open(path, 'r') as f:
+        width, height = [int(i) for i in f.readline().split()]
+        startAndGoal = [int(i) for i in f.readline().split()]
+        rectangles = []
+        for block in f:
+            block = [int(i) for i in block.split()]
+            if len(block) == 4:
+                rectangles.append(tuple(block))
+    return GridMap(path, width, height, rectangles, tuple(startAndGoal[0:2]), tuple(startAndGoal[2:4]))
+
+
+# Every run of obstacles in a row becomes one rectangle of height 1
+def readMovingAiMap(path):
+    with open(path, 'r') as f:
+        header = {}
+        for line in f:
+            line = line.split()
+            if line and line[0] == "map":
+                break
+            if len(line) == 2:
+                header[line[0]] = line[1]
+        width = int(header["width"])
+        height = int(header["height"])
+
+        rectangles = []
+        for y in range(height):
+            row = f.readline().rstrip("\r\n").ljust(width, ".")
+            x = 0
+            while x < width:
+                if row[x] in freeSymbols:
+                    x += 1
+                    continue
+                runStart = x
+                while x < width and row[x] not in freeSymbols:
+                    x += 1
+                rectangles.append((runStart, y, x - runStart, 1))
+    return GridMap(path, width, height, rectangles)
+
+
+def readMap(path):
+    if path.endswith(".map"):
+        return readMovingAiMap(path)
+    return readNavigMap(path)
+
+
+# Map paths in a scenario file are relative to the scenario file, or just a file name next to it
+def readScenarios(path, maps=None):
+    if maps is None:
+        maps = {}
+    directory = os.path.dirname(path)
+
+    scenarios = []
+    with open(path, 'r') as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 8 or fields[0] == "version":
+                continue
+            mapPath = os.path.join(directory, fields[1])
+            if not os.path.exists(mapPath):
+                mapPath = os.path.join(directory, os.path.basename(fields[1]))
+            if mapPath not in maps:
+                maps[mapPath] = readMap(mapPath)
+            startX, startY, goalX, goalY = [int(i) for i in fields[4:8]]
+            scenarios.append(Scenario(maps[mapPath], (startX, startY), (goalX, goalY)))
+    return scenarios
+
+
+# The scenarios of a scenario file, or the start and goal of a navig map
+def loadScenarios(path, maps=None):
+    if path.endswith(".scen"):
+        return readScenarios(path, maps)
+    gridMap = readMap(path)
+    if gridMap.start is None:
+        raise ValueError(path + " has no start and goal, use a scenario file")
+    return [Scenario(gridMap, gridMap.start, gridMap.goal)]
+
+
+# A new headless board with the map, start and goal of the scenario
+def setupBoard(scenario):
+    gridMap = scenario.gridMap
+    board.setDimensions(gridMap.width, gridMap.height, headless=True)
+    board.createBoard()
+    for rectangle in gridMap.rectangles:
+        board.createObstacle(*rectangle)
+    board.createStart(*scenario.start)
+    board.createGoal(*scenario.goal)
+
+    if scenario.optimalLength == UNREACHABLE:
+        scenario.optimalLength = getOptimalLength(gridMap.width, gridMap.height, scenario.start, scenario.goal)
+
+
+# Length of a shortest 4-connected path on the board, None if there is none
+def getOptimalLength(width, height, start, goal):
+    walkable = getWalkableCells(width, height, board.obstacles)
+    source = start[0] * height + start[1]
+    target = goal[0] * height + goal[1]
+    if not walkable[source] or not walkable[target]:
+        return None
+    distances, numberOfCellsExpanded = getDistanceMap(walkable, width, height, source, target)
+    if distances[target] == UNREACHABLE:
+        return None
+    return int(distances[target])
+
+
+# Writes a map in the navig format
+def writeNavigMap(gridMap, path):
+    with open(path, 'w') as f:
+        f.write("%d %d\n" % (gridMap.width, gridMap.height))
+        f.write("%d %d %d %d\n" % (gridMap.start + gridMap.goal))
+        for rectangle in gridMap.rectangles:
+            f.write("%d %d %d %d\n" % rectangle)
+
+
+# Writes scenarios in the MovingAI format, optimal lengths that are not known yet are written as 0
+def writeScenarios(scenarios, path):
+    directory = os.path.dirname(path)
+    with open(path, 'w') as f:
+        f.write("version 1\n")
+        for scenario in scenarios:
+            gridMap = scenario.gridMap
+            optimalLength = scenario.optimalLength
+            if optimalLength is None or optimalLength == UNREACHABLE:
+                optimalLength = 0
+            f.write("0\t%s\t%d\t%d\t%d\t%d\t%d\t%d\t%d\n" % ((os.path.relpath(gridMap.path, directory or "."),
+                                                              gridMap.width, gridMap.height)
+                                                             + scenario.start + scenario.goal + (optimalLength,)))
+
+
+# The obstacles of a map as one entry per cell, True where there is no obstacle
+# Same cell numbering as the board, x*height + y
+def getWalkableArray(gridMap):
+    blocked = np.zeros((gridMap.width, gridMap.height), dtype=bool)
+    for x, y, width, height in gridMap.rectangles:
+        blocked[max(x, 0):x + width, max(y, 0):y + height] = True
+    return ~blocked.ravel()
@@ -0,0 +1,96 @@
+import argparse
+import os
+import random
+
+import numpy as np
+
+from Module1.wavefront import getDistanceMap
+from Module1.benchmark.maps import GridMap, Scenario, getWalkableArray, writeNavigMap, writeScenarios
+
+# Random maps for the benchmark, in the navig format
+# Random rectangles are added until the obstacles cover density of the cells. Start and goal pairs
+# are free cells that can reach each other, the first pair is the start and goal of the map file
+#
+# Usage: python -m Module1.benchmark.randomMaps random.txt --width 2000 --height 2000 --density 0.3 [--scenarios 20]
+# With --scenarios the pairs are also written to random.scen
+
+
+def generateRandomMap(path, width, height, density, maxObstacleSize=8, rng=None):
+    if rng is None:
+        rng = random.Random()
+
+    blocked = np.zeros((width, height), dtype=bool)
+    numberOfBlocked = 0
+    target = int(density * width * height)
+    rectangles = []
+    while numberOfBlocked < target:
+        x = rng.randrange(width)
+        y = rng.randrange(height)
+        rectangleWidth = rng.randint(1, maxObstacleSize)
+        rectangleHeight = rng.randint(1, maxObstacleSize)
+        covered = blocked[x:x + rectangleWidth, y:y + rectangleHeight]
+        numberOfBlocked += covered.size - int(np.count_nonzero(covered))
+        covered[...] = True
+        rectangles.append((x, y, rectangleWidth, rectangleHeight))
+
+    return GridMap(path, width, height, rectangles)
+
+
+# Start and goal pairs that can reach each other, the goal is any cell the start can reach
+# Returns fewer pairs if the free cells are too closed off
+def generateScenarios(gridMap, numberOfScenarios, rng=None, maxTries=100):
+    if rng is None:
+        rng = random.Random()
+
+    walkable = getWalkableArray(gridMap)
+    freeCells = np.flatnonzero(walkable)
+    height = gridMap.height
+
+    scenarios = []
+    tries = 0
+    while len(scenarios) < numberOfScenarios and tries < maxTries and freeCells.size > 0:
+        tries += 1
+        source = int(freeCells[rng.randrange(freeCells.size)])
+        distances, numberOfCellsExpanded = getDistanceMap(walkable, gridMap.width, height, source)
+        reachable = np.flatnonzero(distances > 0)
+        if reachable.size == 0:
+            continue
+        target = int(reachable[rng.randrange(reachable.size)])
+
+        scenario = Scenario(gridMap, divmod(source, height), divmod(target, height))
+        scenario.optimalLength = int(distances[target])
+        scenarios.append(scenario)
+    return scenarios
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Write a random map in the navig format")
+    parser.add_argument("output", help="map file to write")
+    parser.add_argument("--width", type=int, default=1000)
+    parser.add_argument("--height", type=int, default=1000)
+    parser.add_argument("--density", type=float, default=0.2, help="part of the cells covered by obstacles")
+    parser.add_argument("--size", type=int, default=8, help="largest width and height of an obstacle")
+    parser.add_argument("--scenarios", type=int, default=0, help="start and goal pairs to write to a .scen file")
+    parser.add_argument("--seed", type=int, default=None)
+    arguments = parser.parse_args(arguments)
+    if not 0 <= arguments.density < 1:
+        parser.error("density must be at least 0 and below 1")
+
+    rng = random.Random(arguments.seed)
+    gridMap = generateRandomMap(arguments.output, arguments.width, arguments.height, arguments.density,
+                                arguments.size, rng)
+    scenarios = generateScenarios(gridMap, max(arguments.scenarios, 1), rng)
+    if not scenarios:
+        parser.error("no two free cells can reach each other, try a lower density")
+    gridMap.start = scenarios[0].start
+    gridMap.goal = scenarios[0].goal
+
+    writeNavigMap(gridMap, arguments.output)
+    if arguments.scenarios > 0:
+        scenarioPath = os.path.splitext(arguments.output)[0] + ".scen"
+        writeScenarios(scenarios, scenarioPath)
+        print("Wrote", len(scenarios), "scenarios to", scenarioPath)
+
+
+if __name__ == "__main__":
+    main()
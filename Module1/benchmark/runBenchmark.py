@@ -0,0 +1,149 @@
+import argparse
+import contextlib
+import csv
+import io
+import sys
+import tracemalloc
+from time import perf_counter
+
+from Module1.batchProgram import possibleModes, runMode
+from Module1.landmarks import loadLandmarks
+from Module1.contractionHierarchy import loadContractionHierarchy
+from Module1.benchmark.maps import loadScenarios, setupBoard
+
+# Runs every mode on every scenario and checks the path lengths against the shortest 4-connected path
+#
+# Each run is timed on its own, then repeated on a fresh board under tracemalloc for the peak memory,
+# tracemalloc slows the search down too much to time it at the same time.
+# The ALT and CH tables are built before the first run on a map, a run only loads them
+#
+# Usage: python -m Module1.benchmark.runBenchmark Module1/navig1.txt maps/arena.scen ... [--modes astar,jps]
+#        [--output results.csv] [--no-memory]
+# Exits with status 1 if a mode that should find shortest paths returned a longer path, or no path
+
+resultFields = ["map", "scenario", "mode", "found", "pathLength", "optimalLength", "optimal",
+                "generated", "expanded", "nodesPerSecond", "peakBytes", "seconds"]
+
+# Modes that are not meant to find the shortest path, a longer path is reported but is not a failure
+inexactModes = ["dfs", "hpa"]
+
+
+# The optimal length counts moves, pathLength counts the nodes on the path
+def isOptimal(pathLength, optimalLength):
+    if optimalLength is None:
+        return pathLength is None
+    return pathLength == optimalLength + 1
+
+
+def prepareMode(mode, path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "alt":
+            loadLandmarks(path)
+        elif mode == "ch":
+            loadContractionHierarchy(path)
+
+
+def runScenario(scenario, number, mode, measureMemory=True):
+    mapPath = scenario.gridMap.path
+
+    setupBoard(scenario)
+    stats = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        startTime = perf_counter()
+        runMode(mode, mapPath, stats)
+        seconds = perf_counter() - startTime
+
+    peakBytes = None
+    if measureMemory:
+        setupBoard(scenario)
+        with contextlib.redirect_stdout(io.StringIO()):
+            tracemalloc.start()
+            try:
+                runMode(mode, mapPath, {})
+                peakBytes = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    return {"map": mapPath,
+            "scenario": number,
+            "mode": mode,
+            "found": stats["pathLength"] is not None,
+            "pathLength": stats["pathLength"],
+            "optimalLength": scenario.optimalLength,
+            "optimal": isOptimal(stats["pathLength"], scenario.optimalLength),
+            "generated": stats["generated"],
+            "expanded": stats["expanded"],
+            "nodesPerSecond": round(stats["expanded"] / max(seconds, 1e-9)),
+            "peakBytes": peakBytes,
+            "seconds": round(seconds, 6)}
+
+
+# A row that fails the benchmark: a path that is shorter than the shortest one or missing, from any mode,
+# or any path that is not a shortest one from an exact mode
+def isFailure(row):
+    if row["optimal"]:
+        return False
+    if row["mode"] not in inexactModes:
+        return True
+    return row["optimalLength"] is None or row["pathLength"] is None \
+        or row["pathLength"] < row["optimalLength"] + 1
+
+
+# Writes one csv row per run, returns the rows that failed
+def runBenchmark(paths, modes, output, measureMemory=True):
+    maps = {}
+    scenarios = []
+    for path in paths:
+        scenarios.extend(loadScenarios(path, maps))
+
+    writer = csv.DictWriter(output, fieldnames=resultFields)
+    writer.writeheader()
+
+    failures = []
+    prepared = set()
+    for number, scenario in enumerate(scenarios):
+        for mode in modes:
+            if (scenario.gridMap.path, mode) not in prepared:
+                setupBoard(scenario)
+                prepareMode(mode, scenario.gridMap.path)
+                prepared.add((scenario.gridMap.path, mode))
+
+            row = runScenario(scenario, number, mode, measureMemory)
+            writer.writerow(row)
+            output.flush()
+            if isFailure(row):
+                failures.append(row)
+    return failures
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmark the search modes and check that the paths are optimal")
+    parser.add_argument("maps", nargs="+", help="navig map files, or .scen scenario files")
+    parser.add_argument("--modes", default="astar,grid,jps,bidirectional",
+                        help="comma separated, one or more of " + ", ".join(possibleModes))
+    parser.add_argument("--output", default=None, help="csv file, default is stdout")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="do not run again under tracemalloc for the peak memory")
+    arguments = parser.parse_args(arguments)
+
+    modes = arguments.modes.lower().split(",")
+    for mode in modes:
+        if mode not in possibleModes:
+            parser.error("Unknown mode " + mode)
+
+    if arguments.output is None:
+        failures = runBenchmark(arguments.maps, modes, sys.stdout, arguments.memory)
+    else:
+        with open(arguments.output, 'w', newline='') as output:
+            failures = runBenchmark(arguments.maps, modes, output, arguments.memory)
+
+    for row in failures:
+        print("Not optimal: %s scenario %d mode %s, path length %s, optimal length %s"
+              % (row["map"], row["scenario"], row["mode"], row["pathLength"], row["optimalLength"]),
+              file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+from Module1.frontier import HeapFrontier
+from Module1.node import Node
+from Module1.board import manhattenDistToGoalNode
+from Module1.aStarProgram import printSearchStats, saveSearchStats
+
+
+# One direction of the bidirectional search, with its own open and closed list
+class SearchDirection:
+
+    def __init__(self, root, h_func):
+        self.h_func = h_func
+        self.open = HeapFrontier()
+        self.openIndex = {}
+        self.closedIndex = {}
+
+        root.g = 0
+        root.h = h_func(root)
+        root.parent = None
+        self.open.push(root)
+        self.openIndex[root.key()] = root
+
+    # The stored copy of a state, or None if this direction has not seen it
+    def getStored(self, key):
+        stored = self.openIndex.get(key)
+        if stored is None:
+            stored = self.closedIndex.get(key)
+        return stored
+
+
+# Bidirectional A*, one search forward from initialState and one backward from goalState
+# getNeighbours must work both ways, like getSurroundingTiles does on the board
+# h_forward estimates the distance to goalState, h_backward the distance to initialState
+#
+# Every time a direction finds a state the other direction has seen, the path through it is a
+# candidate. The search stops when the lowest f on either open list is at least the best candidate,
+# since every cheaper path would have to go through a node on both open lists
+def bidirectionalAStar(getNeighbours,
+                       h_forward,
+                       h_backward,
+                       initialState,
+                       goalState,
+                       paint,
+                       arcCost=None,
+                       stats=None,
+                       quiet=False):
+
+    if arcCost is None:
+        def arcCost(node1, node2):
+            return 1
+
+    forward = SearchDirection(initialState, h_forward)
+    backward = SearchDirection(goalState, h_backward)
+
+    # Counters to display at the end
+    numberOfNodesGenerated = 2
+    numberOfNodesExpanded = 0
+
+    bestPathCost = float("inf")
+    meeting = None
+
+    # Start and goal are the same state
+    if initialState.key() == goalState.key():
+        bestPathCost = 0
+        meeting = (initialState, goalState)
+
+    while len(forward.open) > 0 and len(backward.open) > 0:
+        if max(forward.open.getMinimumF(), backward.open.getMinimumF()) >= bestPathCost:
+            break
+
+        # Expand the direction with the smallest open list
+        if len(forward.open) <= len(backward.open):
+            direction, otherDirection = forward, backward
+        else:
+            direction, otherDirection = backward, forward
+
+        currentTile = direction.open.pop()
+        numberOfNodesExpanded = numberOfNodesExpanded + 1
+
+        if currentTile.parent is not None or direction is forward:
+            paint(currentTile)
+
+        del direction.openIndex[currentTile.key()]
+        direction.closedIndex[currentTile.key()] = currentTile
+
+        for kid in getNeighbours(currentTile):
+            key = kid.key()
+            storedKid = direction.getStored(key)
+
+            #First time node is visited
+            if storedKid is None:
+                kid.parent = currentTile
+                kid.g = currentTile.g + arcCost(currentTile, kid)
+                kid.h = direction.h_func(kid)
+                direction.open.push(kid)
+                direction.openIndex[key] = kid
+                numberOfNodesGenerated += 1
+                storedKid = kid
+
+            # Better path, closed nodes are opened again
+            elif currentTile.g + arcCost(currentTile, storedKid) < storedKid.g:
+                storedKid.parent = currentTile
+                storedKid.g = currentTile.g + arcCost(currentTile, storedKid)
+                if key in direction.closedIndex:
+                    del direction.closedIndex[key]
+                    direction.open.push(storedKid)
+                    direction.openIndex[key] = storedKid
+                else:
+                    direction.open.update(storedKid)
+            else:
+                continue
+
+            otherKid = otherDirection.getStored(key)
+            if otherKid is not None and storedKid.g + otherKid.g < bestPathCost:
+                bestPathCost = storedKid.g + otherKid.g
+                if direction is forward:
+                    meeting = (storedKid, otherKid)
+                else:
+                    meeting = (otherKid, storedKid)
+
+    if meeting is None:
+        if not quiet:
+            print("No goal found")
+        saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, None)
+        return None
+
+    goalNode = joinPaths(meeting[0], meeting[1], arcCost)
+    numberOfNodesInSolutionPath = 1
+    node = goalNode
+    while node.parent is not None:
+        numberOfNodesInSolutionPath = numberOfNodesInSolutionPath + 1
+        node = node.parent
+
+    if not quiet:
+        printSearchStats("Bidirectional A*", numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+    saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+    return goalNode
+
+
+# Turns the parent pointers of the backward half around, so it continues the forward half
+# Returns the goal state, with the whole path from the initial state in its parent chain
+def joinPaths(forwardNode, backwardNode, arcCost):
+    previous = forwardNode
+    node = backwardNode.parent
+    while node is not None:
+        nextNode = node.parent
+        node.parent = previous
+        node.g = previous.g + arcCost(previous, node)
+        previous = node
+        node = nextNode
+    return previous
+
+
+def manhattenDistToStartNode(node):
+    return abs(node.x - Node.startNode.x) + abs(node.y - Node.startNode.y)
+
+
+# Bidirectional A* on the board, from Node.startNode to Node.goalX, Node.goalY
+def bidirectionalGridAStar(getNeighbours, paint, stats=None):
+    return bidirectionalAStar(getNeighbours, manhattenDistToGoalNode, manhattenDistToStartNode,
+                              Node.startNode, Node(Node.goalX, Node.goalY), paint, stats=stats)
@@ -1,5 +1,12 @@
-from graphics import *
+from tkinter import TclError
+try:
+    from graphics import *
+except TclError:
+    # No display, the board can only be used headless
+    GraphWin = None
 from Module1.node import *
+from Module1.obstacleGrid import ObstacleGrid
+from Module1.rectangleIndex import RectangleIndex
 
 height = 9
 width = 9
@@ -8,26 +15,78 @@ size = 40
 
 win = None
 
-obstacles = []
+# Boards with more cells than this keep their obstacles as rectangles instead of one bit per cell
+maxGridCells = 10 ** 8
+
+obstacles = ObstacleGrid(width, height)
+
+# Called with startX, startY, width, height after every createObstacle and removeObstacle, see addObstacleListener
+obstacleListeners = []
 
 def getWindow():
     return win
 
-def setDimensions(x,y):
+# Headless boards have no window, nothing is drawn
+def setDimensions(x,y,headless=False):
     global width
     global height
     global win
     width = x
     height = y
 
-    win = GraphWin('A* search', height*size+5, width*size+5)
+    if headless:
+        win = None
+    else:
+        win = GraphWin('A* search', height*size+5, width*size+5)
+
+# Reads a board file: "width height", "startX startY goalX goalY" and then one "x y width height" obstacle per line
+# Returns the dimensions of the board
+def loadBoard(f, headless=False):
+    width, height = [int(i) for i in f.readline().split()]
+    setDimensions(width, height, headless)
+
+    createBoard()
+
+    startAndGoal = [int(i) for i in f.readline().split()]
+    createStart(startAndGoal[0], startAndGoal[1])
+    createGoal(startAndGoal[2], startAndGoal[3])
+
+    for block in f:
+        block = [int(i) for i in block.split()]
+        if len(block) == 4:
+            createObstacle(block[0], block[1], block[2], block[3])
+
+    return width, height
+
+# Lets data made from the obstacles, like the clusters in hierarchical, update itself
+# The listeners are dropped when a new board is created
+def addObstacleListener(listener):
+    obstacleListeners.append(listener)
 
 def createObstacle(startX,startY,widht,height):
+    obstacles.addRectangle(startX, startY, widht, height)
+    for listener in obstacleListeners:
+        listener(startX, startY, widht, height)
+    if win is None:
+        return
     for x in range(0,widht):
         for y in range(0,height):
-            obstacles.append((startX + x, startY + y))
             drawBox(startX + x, startY + y, "black")
 
+# Takes out an obstacle made by createObstacle with the same numbers
+# Cells that another obstacle covers are still obstacles
+def removeObstacle(startX,startY,widht,height):
+    if not obstacles.removeRectangle(startX, startY, widht, height):
+        return
+    for listener in obstacleListeners:
+        listener(startX, startY, widht, height)
+    if win is None:
+        return
+    for x in range(max(startX, 0), min(startX + widht, obstacles.width)):
+        for y in range(max(startY, 0), min(startY + height, obstacles.height)):
+            if not obstacles.isObstacle(x, y):
+                drawBox(x, y, "light grey")
+
 # Save and draw startnode
 def createStart(startX,startY):
     Node.startNode = Node(startX, startY)
@@ -41,6 +100,8 @@ def createGoal(startX,startY):
 
 # Main draw method for module 1
 def drawBox(x, y, color):
+    if win is None:
+        return
     head2 = Rectangle(Point(x*size +5,height*size - y*size - size+5), Point( x*size + size+5,height*size - y*size +5)) # set center and radius
     head2.setFill(color)
     #head2.setOutline("black")
@@ -57,6 +118,10 @@ def euclideanDistToGoalNode(node):
     yDist = (node.y - Node.goalY)**2
     return (xDist + yDist) ** 0.5
 
+# Inside the board and not an obstacle
+def isWalkable(x, y):
+    return 0 <= x < width and 0 <= y < height and not obstacles.isObstacle(x, y)
+
 # Generates the new child-nodes to this node
 # Ignores wall, of course
 def getSurroundingTiles(node):
@@ -64,14 +129,15 @@ def getSurroundingTiles(node):
 
     x = node.x
     y = node.y
+    i = obstacles.cellId(x, y)
 
-    if x > 0 and not (x-1, y) in obstacles:
+    if x > 0 and not obstacles.isBlocked(i - height):
         surroundingTiles.append(Node(x-1, y))
-    if x < width - 1 and not (x+1, y) in obstacles:
+    if x < width - 1 and not obstacles.isBlocked(i + height):
         surroundingTiles.append(Node(x+1, y))
-    if y > 0 and not (x, y-1) in obstacles:
+    if y > 0 and not obstacles.isBlocked(i - 1):
         surroundingTiles.append(Node(x, y-1))
-    if y < height - 1 and not (x, y+1) in obstacles:
+    if y < height - 1 and not obstacles.isBlocked(i + 1):
         surroundingTiles.append(Node(x, y+1))
 
     if node.parent in surroundingTiles:
@@ -81,7 +147,14 @@ def getSurroundingTiles(node):
 # Initializes board with only grey tiles
 def createBoard():
     global obstacles
-    obstacles = []
+    global obstacleListeners
+    if width * height > maxGridCells:
+        obstacles = RectangleIndex(width, height)
+    else:
+        obstacles = ObstacleGrid(width, height)
+    obstacleListeners = []
+    if win is None:
+        return
     for x in range(0,height):
         for y in range(0,width):
             drawBox(x, y, "light grey")
@@ -0,0 +1,166 @@
+import os
+import pickle
+import struct
+import zlib
+from time import perf_counter
+
+from Module1.node import Node
+
+# Checkpoints for aStarAlgorithm, so a long search can go on after the process is killed
+#
+# The checkpoint file is a log that is only appended to. Every chunk holds what happened since the last one:
+# - NEW: a state seen for the first time, encoded, with g, h and the id of its parent
+# - UPDATE: a better g and parent for a state
+# - CLOSE: the state popped from the open list
+# - KIDS: the stored kids of an expanded state, for propagating better paths later
+# and the counters at the end of the chunk. States get ids in the order they are seen, the initial state is 0.
+# A chunk is written every everyExpansions expansions or everySeconds seconds, whichever comes first.
+#
+# To resume, aStarAlgorithm plays the events back on a new open list: the same pushes, updates and pops in
+# the same order give back the same open list, ties included, without calling getNeighbours again.
+# A chunk cut off by a kill is dropped, the search goes on from the chunk before it.
+#
+# encode turns a state into something small that pickles, decode turns it back. The default is the key of
+# a Module1 Node, Module2 has its own in aStarGacProgram.getStateCodec
+
+NEW = 0
+UPDATE = 1
+CLOSE = 2
+KIDS = 3
+
+fileHeader = struct.Struct("<4sI")
+chunkHeader = struct.Struct("<II")
+magic = b"ASCK"
+version = 1
+
+
+def encodeNode(node):
+    return node.key()
+
+
+def decodeNode(key):
+    return Node(*key)
+
+
+class SearchCheckpoint:
+
+    def __init__(self, path, everyExpansions=10000, everySeconds=None, encode=None, decode=None):
+        self.path = path
+        self.everyExpansions = everyExpansions
+        self.everySeconds = everySeconds
+        self.encode = encodeNode if encode is None else encode
+        self.decode = decodeNode if decode is None else decode
+
+        # Id of every state seen, by key
+        self.ids = {}
+        self.events = []
+        self.file = None
+        self.numberOfExpansions = 0
+        self.lastWrite = perf_counter()
+
+    def setCodec(self, encode, decode):
+        self.encode = encode
+        self.decode = decode
+
+    # The events of every whole chunk in the file, and the counters of the last one
+    # Returns None if there is no checkpoint yet. A cut off chunk at the end is removed from the file
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+
+        events = []
+        counters = None
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        if len(data) < fileHeader.size:
+            return None
+        fileMagic, fileVersion = fileHeader.unpack_from(data, 0)
+        if fileMagic != magic or fileVersion != version:
+            raise ValueError(self.path + " is not a search checkpoint")
+
+        offset = fileHeader.size
+        while offset + chunkHeader.size <= len(data):
+            length, checksum = chunkHeader.unpack_from(data, offset)
+            payload = data[offset + chunkHeader.size:offset + chunkHeader.size + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            chunkEvents, counters = pickle.loads(payload)
+            events.extend(chunkEvents)
+            offset += chunkHeader.size + length
+
+        if offset < len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+        if counters is None:
+            return None
+        return events, counters
+
+    # Starts logging, states is every state already known, in id order
+    def start(self, states):
+        self.ids = {}
+        for state in states:
+            self.ids[state.key()] = len(self.ids)
+        self.events = []
+        self.numberOfExpansions = 0
+        self.lastWrite = perf_counter()
+
+        isNew = not os.path.exists(self.path) or os.path.getsize(self.path) < fileHeader.size
+        self.file = open(self.path, 'wb' if isNew else 'ab')
+        if isNew:
+            self.file.write(fileHeader.pack(magic, version))
+            self.file.flush()
+
+    def addNode(self, node):
+        nodeId = len(self.ids)
+        self.ids[node.key()] = nodeId
+        self.events.append((NEW, nodeId, self.encode(node), node.g, node.h, self.ids[node.parent.key()]))
+
+    def updateNode(self, node):
+        self.events.append((UPDATE, self.ids[node.key()], node.g, self.ids[node.parent.key()]))
+
+    def closeNode(self, node):
+        self.events.append((CLOSE, self.ids[node.key()]))
+
+    def setKids(self, node, kids):
+        ids = self.ids
+        self.events.append((KIDS, ids[node.key()], tuple(ids[kid.key()] for kid in kids)))
+
+    # Called after every expansion, writes a chunk when one is due
+    def tick(self, counters):
+        self.numberOfExpansions += 1
+        if self.everyExpansions is not None and self.numberOfExpansions >= self.everyExpansions:
+            self.write(counters)
+        elif self.everySeconds is not None and perf_counter() - self.lastWrite >= self.everySeconds:
+            self.write(counters)
+
+    def write(self, counters):
+        payload = pickle.dumps((self.events, counters), protocol=pickle.HIGHEST_PROTOCOL)
+        self.file.write(chunkHeader.pack(len(payload), zlib.crc32(payload)))
+        self.file.write(payload)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.events = []
+        self.numberOfExpansions = 0
+        self.lastWrite = perf_counter()
+
+    # Writes what is left and closes the file
+    def close(self, counters):
+        if self.file is None:
+            return
+        self.write(counters)
+        self.file.close()
+        self.file = None
+
+    # Closes the file without writing what is left, for a search that stopped in the middle of an expansion
+    # Does nothing after close
+    def abandon(self):
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exception, traceback):
+        self.abandon()
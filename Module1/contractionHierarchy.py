@@ -0,0 +1,372 @@
+import argparse
+import contextlib
+import heapq
+import io
+import os
+import random
+import struct
+import sys
+from array import array
+from time import perf_counter
+
+from Module1 import board
+from Module1.node import Node
+from Module1.aStarProgram import aStarAlgorithm, printSearchStats, saveSearchStats, noPaint
+from Module1.landmarks import getMapHash
+from Module1.wavefront import getNodePath
+
+# Contraction hierarchy for many queries on the same static board
+#
+# Offline, the free cells are contracted one by one, least important first. When a cell is taken
+# out, a shortcut is added between two of its neighbours if the path through it was the only
+# shortest one. Every cell keeps the edges to the cells contracted after it (its upward edges).
+# A query searches only upward edges, from start and from goal at the same time, and the best
+# cell where the two searches meet is on a shortest path. Shortcuts remember the cell they skip,
+# so the path can be unpacked back into cells
+#
+# Usage: python -m Module1.contractionHierarchy Module1/navig1.txt Module1/navig2.txt ... [--queries 1000]
+# Builds or loads <map>.ch next to each map and compares the query time with aStarAlgorithm
+
+fileMagic = b"CH01"
+# magic, width, height, number of nodes, number of upward edges, map hash
+headerFormat = "<4sIIII40s"
+
+# Cells settled by a witness search before it gives up and the shortcut is added anyway
+maxWitnessSettled = 60
+
+
+def getHierarchyFile(mapPath):
+    return os.path.splitext(mapPath)[0] + ".ch"
+
+
+class ContractionHierarchy:
+
+    # Nodes are numbered 0..n-1, nodeCells gives the cell id (x*height + y) of each node
+    # The upward edges of node v are firstEdge[v] up to firstEdge[v + 1] in the edge arrays,
+    # edgeMiddles is the skipped node of a shortcut and -1 for an edge of the board
+    def __init__(self, width, height, mapHash, nodeCells, ranks, firstEdge, edgeTargets, edgeCosts, edgeMiddles):
+        self.width = width
+        self.height = height
+        self.mapHash = mapHash
+        self.nodeCells = nodeCells
+        self.ranks = ranks
+        self.firstEdge = firstEdge
+        self.edgeTargets = edgeTargets
+        self.edgeCosts = edgeCosts
+        self.edgeMiddles = edgeMiddles
+
+        self.cellNodes = {cell: node for node, cell in enumerate(nodeCells)}
+
+    @staticmethod
+    def build(width, height, obstacles):
+        nodeCells = [cell for cell in range(width * height) if not obstacles.isBlocked(cell)]
+        cellNodes = {cell: node for node, cell in enumerate(nodeCells)}
+        numberOfNodes = len(nodeCells)
+
+        # Edges between nodes that are not contracted yet: node -> neighbour -> (cost, middle)
+        edges = [{} for i in range(numberOfNodes)]
+        for node, cell in enumerate(nodeCells):
+            x, y = divmod(cell, height)
+            for kidCell, inside in ((cell + height, x < width - 1), (cell + 1, y < height - 1)):
+                if inside and kidCell in cellNodes:
+                    kid = cellNodes[kidCell]
+                    edges[node][kid] = (1, -1)
+                    edges[kid][node] = (1, -1)
+
+        # Shortest path from source to the targets that does not go through skipped
+        # Stops at maxCost or after maxWitnessSettled nodes, so distances can be too high but never too low
+        def witnessSearch(source, skipped, maxCost, targets):
+            distances = {source: 0}
+            heap = [(0, source)]
+            settled = 0
+            targetsLeft = len(targets)
+            while heap and settled < maxWitnessSettled and targetsLeft > 0:
+                distance, node = heapq.heappop(heap)
+                if distance > distances[node]:
+                    continue
+                if distance > maxCost:
+                    break
+                settled += 1
+                if node in targets:
+                    targetsLeft -= 1
+                for kid, (cost, middle) in edges[node].items():
+                    if kid != skipped and distance + cost < distances.get(kid, maxCost + 1):
+                        distances[kid] = distance + cost
+                        heapq.heappush(heap, (distance + cost, kid))
+            return distances
+
+        # The shortcuts needed when node is contracted, as (u, w, cost)
+        def getShortcuts(node):
+            neighbours = list(edges[node].items())
+            shortcuts = []
+            for u, (costU, middle) in neighbours:
+                viaCosts = {w: costU + costW for w, (costW, middleW) in neighbours if w > u}
+                if not viaCosts:
+                    continue
+                distances = witnessSearch(u, node, max(viaCosts.values()), viaCosts)
+                for w, viaCost in viaCosts.items():
+                    if distances.get(w, viaCost + 1) > viaCost:
+                        shortcuts.append((u, w, viaCost))
+            return shortcuts
+
+        contractedNeighbours = [0] * numberOfNodes
+
+        def getPriority(node):
+            return len(getShortcuts(node)) - len(edges[node]) + contractedNeighbours[node]
+
+        heap = [(getPriority(node), node) for node in range(numberOfNodes)]
+        heapq.heapify(heap)
+
+        ranks = [0] * numberOfNodes
+        upwardEdges = [None] * numberOfNodes
+        contracted = [False] * numberOfNodes
+        rank = 0
+        while heap:
+            priority, node = heapq.heappop(heap)
+            if contracted[node]:
+                continue
+            # Lazy update, the priority may have gone up since it was pushed
+            priority = getPriority(node)
+            if heap and priority > heap[0][0]:
+                heapq.heappush(heap, (priority, node))
+                continue
+
+            for u, w, viaCost in getShortcuts(node):
+                if viaCost < edges[u].get(w, (viaCost + 1, -1))[0]:
+                    edges[u][w] = (viaCost, node)
+                    edges[w][u] = (viaCost, node)
+
+            upwardEdges[node] = sorted((kid, cost, middle) for kid, (cost, middle) in edges[node].items())
+            for kid in edges[node]:
+                del edges[kid][node]
+                contractedNeighbours[kid] += 1
+            edges[node] = {}
+            contracted[node] = True
+            ranks[node] = rank
+            rank += 1
+
+        firstEdge = array("i", [0])
+        edgeTargets = array("i")
+        edgeCosts = array("i")
+        edgeMiddles = array("i")
+        for node in range(numberOfNodes):
+            for kid, cost, middle in upwardEdges[node]:
+                edgeTargets.append(kid)
+                edgeCosts.append(cost)
+                edgeMiddles.append(middle)
+            firstEdge.append(len(edgeTargets))
+
+        return ContractionHierarchy(width, height, getMapHash(width, height, obstacles), array("i", nodeCells),
+                                    array("i", ranks), firstEdge, edgeTargets, edgeCosts, edgeMiddles)
+
+    # The header, then the arrays as little endian 32 bit integers
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(struct.pack(headerFormat, fileMagic, self.width, self.height,
+                                len(self.nodeCells), len(self.edgeTargets), self.mapHash.encode()))
+            for values in (self.nodeCells, self.ranks, self.firstEdge, self.edgeTargets, self.edgeCosts, self.edgeMiddles):
+                if sys.byteorder == "big":
+                    values = array("i", values)
+                    values.byteswap()
+                values.tofile(f)
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as f:
+            magic, width, height, numberOfNodes, numberOfEdges, mapHash = \
+                struct.unpack(headerFormat, f.read(struct.calcsize(headerFormat)))
+            if magic != fileMagic:
+                raise ValueError("Not a contraction hierarchy file: " + path)
+
+            arrays = []
+            for length in (numberOfNodes, numberOfNodes, numberOfNodes + 1, numberOfEdges, numberOfEdges, numberOfEdges):
+                values = array("i")
+                values.fromfile(f, length)
+                if sys.byteorder == "big":
+                    values.byteswap()
+                arrays.append(values)
+
+        return ContractionHierarchy(width, height, mapHash.decode(), *arrays)
+
+    # The upward edge between two nodes, it is stored with the one that was contracted first
+    def getEdge(self, node1, node2):
+        if self.ranks[node1] > self.ranks[node2]:
+            node1, node2 = node2, node1
+        bestEdge = None
+        for edge in range(self.firstEdge[node1], self.firstEdge[node1 + 1]):
+            if self.edgeTargets[edge] == node2 and (bestEdge is None or self.edgeCosts[edge] < self.edgeCosts[bestEdge]):
+                bestEdge = edge
+        return bestEdge
+
+    # Replaces shortcuts by the nodes they skip, adds the nodes after node1 up to node2 to path
+    def unpackEdge(self, node1, node2, path):
+        stack = [(node1, node2)]
+        while stack:
+            node1, node2 = stack.pop()
+            middle = self.edgeMiddles[self.getEdge(node1, node2)]
+            if middle < 0:
+                path.append(node2)
+            else:
+                stack.append((middle, node2))
+                stack.append((node1, middle))
+
+    # Shortest path between two cells
+    # Returns the path as a list of cell ids and the search counters, the path is None if there is none
+    def query(self, startCell, goalCell):
+        start = self.cellNodes.get(startCell)
+        goal = self.cellNodes.get(goalCell)
+        if start is None or goal is None:
+            return None, 0, 0
+
+        firstEdge = self.firstEdge
+        edgeTargets = self.edgeTargets
+        edgeCosts = self.edgeCosts
+
+        # Forward and backward search: distances, parents and open list
+        distances = ({start: 0}, {goal: 0})
+        parents = ({start: None}, {goal: None})
+        heaps = ([(0, start)], [(0, goal)])
+        bestCost = float("inf")
+        meeting = None
+        numberOfNodesExpanded = 0
+
+        direction = 0
+        while (heaps[0] and heaps[0][0][0] < bestCost) or (heaps[1] and heaps[1][0][0] < bestCost):
+            # Take turns, unless one of the searches is done
+            if not heaps[direction] or heaps[direction][0][0] >= bestCost:
+                direction = 1 - direction
+            distance, node = heapq.heappop(heaps[direction])
+            ownDistances = distances[direction]
+            if distance > ownDistances[node]:
+                continue
+            numberOfNodesExpanded += 1
+
+            otherDistance = distances[1 - direction].get(node)
+            if otherDistance is not None and distance + otherDistance < bestCost:
+                bestCost = distance + otherDistance
+                meeting = node
+
+            for edge in range(firstEdge[node], firstEdge[node + 1]):
+                kid = edgeTargets[edge]
+                kidDistance = distance + edgeCosts[edge]
+                if kidDistance < ownDistances.get(kid, bestCost):
+                    ownDistances[kid] = kidDistance
+                    parents[direction][kid] = node
+                    heapq.heappush(heaps[direction], (kidDistance, kid))
+            direction = 1 - direction
+
+        numberOfNodesGenerated = len(distances[0]) + len(distances[1])
+        if meeting is None:
+            return None, numberOfNodesGenerated, numberOfNodesExpanded
+
+        # Up from start to the meeting node, then down to goal
+        upward = []
+        node = meeting
+        while node is not None:
+            upward.append(node)
+            node = parents[0][node]
+        upward.reverse()
+        downward = []
+        node = parents[1][meeting]
+        while node is not None:
+            downward.append(node)
+            node = parents[1][node]
+
+        path = [start]
+        for node1, node2 in zip(upward + downward, (upward + downward)[1:]):
+            self.unpackEdge(node1, node2, path)
+        return [self.nodeCells[node] for node in path], numberOfNodesGenerated, numberOfNodesExpanded
+
+
+# The hierarchy of the board that is loaded from mapPath
+# A saved hierarchy is used if it belongs to the same obstacles, if not it is built and saved
+def loadContractionHierarchy(mapPath):
+    mapHash = getMapHash(board.width, board.height, board.obstacles)
+    hierarchyFile = getHierarchyFile(mapPath)
+
+    if os.path.exists(hierarchyFile):
+        try:
+            hierarchy = ContractionHierarchy.load(hierarchyFile)
+        except (OSError, ValueError, EOFError, struct.error):
+            hierarchy = None
+        if hierarchy is not None and hierarchy.mapHash == mapHash:
+            return hierarchy
+
+    hierarchy = ContractionHierarchy.build(board.width, board.height, board.obstacles)
+    hierarchy.save(hierarchyFile)
+    return hierarchy
+
+
+# Contraction hierarchy query from Node.startNode to Node.goalX, Node.goalY
+# Only the solution is painted
+def contractionHierarchySearch(hierarchy, paint, stats=None):
+    height = board.height
+    path, numberOfNodesGenerated, numberOfNodesExpanded = \
+        hierarchy.query(Node.startNode.x * height + Node.startNode.y, Node.goalX * height + Node.goalY)
+
+    if path is None:
+        print("No goal found")
+        saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, None)
+        return None
+
+    goalNode = getNodePath(path, height)
+    paint(goalNode)
+    printSearchStats("Contraction hierarchy", numberOfNodesGenerated, numberOfNodesExpanded, len(path))
+    saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, len(path))
+    return goalNode
+
+
+# Random queries between free cells of each map, answered by the hierarchy and by aStarAlgorithm
+# Prints the average time per query, and counts the queries where the path lengths differ
+def benchmark(mapPaths, numberOfQueries=1000, seed=0):
+    rng = random.Random(seed)
+    print("map, build or load seconds, hierarchy query microseconds, A* query microseconds, speedup, mismatches")
+    for mapPath in mapPaths:
+        with open(mapPath, 'r') as f:
+            board.loadBoard(f, headless=True)
+
+        startTime = perf_counter()
+        hierarchy = loadContractionHierarchy(mapPath)
+        loadSeconds = perf_counter() - startTime
+
+        cells = list(hierarchy.nodeCells)
+        queries = [(rng.choice(cells), rng.choice(cells)) for i in range(numberOfQueries)]
+
+        hierarchyLengths = []
+        startTime = perf_counter()
+        for startCell, goalCell in queries:
+            path = hierarchy.query(startCell, goalCell)[0]
+            hierarchyLengths.append(None if path is None else len(path))
+        hierarchySeconds = perf_counter() - startTime
+
+        aStarLengths = []
+        stats = {}
+        startTime = perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for startCell, goalCell in queries:
+                board.createStart(*divmod(startCell, board.height))
+                board.createGoal(*divmod(goalCell, board.height))
+                aStarAlgorithm(board.getSurroundingTiles, board.manhattenDistToGoalNode, Node.startNode, noPaint,
+                               stats=stats)
+                aStarLengths.append(stats["pathLength"])
+        aStarSeconds = perf_counter() - startTime
+
+        mismatches = sum(1 for a, b in zip(hierarchyLengths, aStarLengths) if a != b)
+        print("%s, %.3f, %.1f, %.1f, %.1f, %d" % (mapPath, loadSeconds,
+                                                 hierarchySeconds / numberOfQueries * 1e6,
+                                                 aStarSeconds / numberOfQueries * 1e6,
+                                                 aStarSeconds / max(hierarchySeconds, 1e-9),
+                                                 mismatches))
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Compare contraction hierarchy queries with aStarAlgorithm")
+    parser.add_argument("maps", nargs="+", help="map files, same format as navig1.txt")
+    parser.add_argument("--queries", type=int, default=1000, help="random queries per map")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args(arguments)
+    benchmark(arguments.maps, arguments.queries, arguments.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+import argparse
+import contextlib
+import heapq
+import io
+import random
+from itertools import count
+from time import perf_counter
+
+from Module1 import board
+from Module1.node import Node
+from Module1.aStarProgram import aStarAlgorithm, printSearchStats, saveSearchStats, noPaint
+from Module1.wavefront import getNodePath
+
+# D* Lite, replanning on the board when obstacles come and go
+#
+# The search runs backwards, from the goal to the start, and keeps g and rhs (the best g one step
+# ahead) for every cell it has seen. When cells change, only those cells and their neighbours are
+# updated, and the next plan only expands the cells whose g values turned out to be wrong.
+# The start may move between plans, the goal may not
+#
+# Usage: python -m Module1.dStarLite Module1/navig1.txt Module1/navig2.txt ... [--changes 50]
+# Adds and removes random obstacles, and compares replanning with a new aStarAlgorithm run
+
+infinity = float("inf")
+
+
+class DStarLite:
+
+    def __init__(self, width, height, obstacles, startX, startY, goalX, goalY):
+        self.width = width
+        self.height = height
+        self.obstacles = obstacles
+        self.start = startX * height + startY
+        self.goal = goalX * height + goalY
+        # Added to every key when the start moves, so the old keys stay lower bounds
+        self.keyModifier = 0
+
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.heap = []
+        self.queued = {}
+        self.counter = count()
+        self.push(self.goal)
+
+        # Counters of the last plan
+        self.numberOfNodesExpanded = 0
+
+    def isFree(self, cell):
+        return not self.obstacles.isBlocked(cell)
+
+    def getNeighbourCells(self, cell):
+        height = self.height
+        x, y = divmod(cell, height)
+        neighbours = []
+        if x > 0:
+            neighbours.append(cell - height)
+        if x < self.width - 1:
+            neighbours.append(cell + height)
+        if y > 0:
+            neighbours.append(cell - 1)
+        if y < height - 1:
+            neighbours.append(cell + 1)
+        return neighbours
+
+    # Manhattan distance from the start
+    def heuristic(self, cell):
+        x, y = divmod(cell, self.height)
+        startX, startY = divmod(self.start, self.height)
+        return abs(x - startX) + abs(y - startY)
+
+    def calculateKey(self, cell):
+        best = min(self.g.get(cell, infinity), self.rhs.get(cell, infinity))
+        return best + self.heuristic(cell) + self.keyModifier, best
+
+    # The open list is a heap with lazy removal, queued holds the current key of every cell on it
+    def push(self, cell):
+        key = self.calculateKey(cell)
+        self.queued[cell] = key
+        heapq.heappush(self.heap, (key, next(self.counter), cell))
+
+    def getTopKey(self):
+        while self.heap and self.queued.get(self.heap[0][2]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return infinity, infinity
+        return self.heap[0][0]
+
+    def updateVertex(self, cell):
+        if cell != self.goal:
+            best = infinity
+            if self.isFree(cell):
+                for neighbour in self.getNeighbourCells(cell):
+                    if self.isFree(neighbour):
+                        best = min(best, 1 + self.g.get(neighbour, infinity))
+            self.rhs[cell] = best
+        self.queued.pop(cell, None)
+        if self.g.get(cell, infinity) != self.rhs.get(cell, infinity):
+            self.push(cell)
+
+    def computeShortestPath(self):
+        numberOfNodesExpanded = 0
+        while self.getTopKey() < self.calculateKey(self.start) \
+                or self.rhs.get(self.start, infinity) != self.g.get(self.start, infinity):
+            oldKey, tieBreak, cell = heapq.heappop(self.heap)
+            del self.queued[cell]
+            numberOfNodesExpanded += 1
+
+            newKey = self.calculateKey(cell)
+            if oldKey < newKey:
+                self.push(cell)
+            elif self.g.get(cell, infinity) > self.rhs.get(cell, infinity):
+                self.g[cell] = self.rhs[cell]
+                for neighbour in self.getNeighbourCells(cell):
+                    self.updateVertex(neighbour)
+            else:
+                self.g[cell] = infinity
+                self.updateVertex(cell)
+                for neighbour in self.getNeighbourCells(cell):
+                    self.updateVertex(neighbour)
+        self.numberOfNodesExpanded = numberOfNodesExpanded
+
+    # The cells whose obstacle changed, as (x, y). Their edges all changed cost
+    def updateCells(self, cells):
+        for x, y in cells:
+            cell = x * self.height + y
+            self.updateVertex(cell)
+            for neighbour in self.getNeighbourCells(cell):
+                self.updateVertex(neighbour)
+
+    # Obstacle listener for createObstacle and removeObstacle
+    def updateRegion(self, startX, startY, width, height):
+        self.updateCells([(x, y) for x in range(max(startX, 0), min(startX + width, self.width))
+                          for y in range(max(startY, 0), min(startY + height, self.height))])
+
+    def moveStart(self, x, y):
+        cell = x * self.height + y
+        if cell != self.start:
+            self.keyModifier += self.heuristic(cell)
+            self.start = cell
+
+    # A shortest path from start to goal as a list of cell ids, or None if there is none
+    def plan(self):
+        self.computeShortestPath()
+        if self.g.get(self.start, infinity) == infinity:
+            return None
+
+        path = [self.start]
+        cell = self.start
+        while cell != self.goal:
+            cell = min((neighbour for neighbour in self.getNeighbourCells(cell) if self.isFree(neighbour)),
+                       key=lambda neighbour: self.g.get(neighbour, infinity))
+            path.append(cell)
+        return path
+
+
+planner = None
+
+
+# The planner of the current board and goal, kept up to date with createObstacle and removeObstacle
+def getPlanner():
+    global planner
+    height = board.height
+    if planner is None or planner.obstacles is not board.obstacles \
+            or planner.goal != Node.goalX * height + Node.goalY:
+        planner = DStarLite(board.width, height, board.obstacles,
+                            Node.startNode.x, Node.startNode.y, Node.goalX, Node.goalY)
+        board.addObstacleListener(planner.updateRegion)
+    else:
+        planner.moveStart(Node.startNode.x, Node.startNode.y)
+    return planner
+
+
+# D* Lite from Node.startNode to Node.goalX, Node.goalY, reusing the last plan on this board
+# Only the solution is painted
+def dStarLiteSearch(paint, stats=None):
+    dStar = getPlanner()
+    path = dStar.plan()
+    numberOfNodesGenerated = len(dStar.rhs)
+
+    if path is None:
+        print("No goal found")
+        saveSearchStats(stats, numberOfNodesGenerated, dStar.numberOfNodesExpanded, None)
+        return None
+
+    goalNode = getNodePath(path, board.height)
+    paint(goalNode)
+    printSearchStats("D* Lite", numberOfNodesGenerated, dStar.numberOfNodesExpanded, len(path))
+    saveSearchStats(stats, numberOfNodesGenerated, dStar.numberOfNodesExpanded, len(path))
+    return goalNode
+
+
+# Adds and removes random obstacles on each map, and plans again after every change
+# Prints the average time per plan and expansions for D* Lite and for aStarAlgorithm from scratch,
+# and counts the changes after which the path lengths differ
+def benchmark(mapPaths, numberOfChanges=50, maxObstacleSize=4, seed=0):
+    rng = random.Random(seed)
+    print("map, D* Lite milliseconds, D* Lite expanded, A* milliseconds, A* expanded, speedup, mismatches")
+    for mapPath in mapPaths:
+        with open(mapPath, 'r') as f:
+            width, height = board.loadBoard(f, headless=True)
+
+        startX, startY = Node.startNode.x, Node.startNode.y
+        with contextlib.redirect_stdout(io.StringIO()):
+            dStarLiteSearch(noPaint)
+
+        added = []
+        dStarSeconds = aStarSeconds = 0
+        dStarExpanded = aStarExpanded = 0
+        mismatches = 0
+        numberOfPlans = 0
+        for change in range(numberOfChanges):
+            if added and rng.random() < 0.3:
+                board.removeObstacle(*added.pop(rng.randrange(len(added))))
+            else:
+                rectangle = (rng.randrange(width), rng.randrange(height),
+                             rng.randint(1, maxObstacleSize), rng.randint(1, maxObstacleSize))
+                # Start and goal stay free
+                if rectangle[0] <= startX < rectangle[0] + rectangle[2] and rectangle[1] <= startY < rectangle[1] + rectangle[3]:
+                    continue
+                if rectangle[0] <= Node.goalX < rectangle[0] + rectangle[2] and rectangle[1] <= Node.goalY < rectangle[1] + rectangle[3]:
+                    continue
+                board.createObstacle(*rectangle)
+                added.append(rectangle)
+
+            dStarStats = {}
+            aStarStats = {}
+            with contextlib.redirect_stdout(io.StringIO()):
+                startTime = perf_counter()
+                dStarLiteSearch(noPaint, stats=dStarStats)
+                dStarSeconds += perf_counter() - startTime
+
+                startTime = perf_counter()
+                aStarAlgorithm(board.getSurroundingTiles, board.manhattenDistToGoalNode, Node(startX, startY), noPaint,
+                               stats=aStarStats)
+                aStarSeconds += perf_counter() - startTime
+
+            numberOfPlans += 1
+            dStarExpanded += dStarStats["expanded"]
+            aStarExpanded += aStarStats["expanded"]
+            if dStarStats["pathLength"] != aStarStats["pathLength"]:
+                mismatches += 1
+
+        numberOfPlans = max(numberOfPlans, 1)
+        print("%s, %.3f, %.1f, %.3f, %.1f, %.1f, %d" % (mapPath,
+                                                       dStarSeconds / numberOfPlans * 1e3,
+                                                       dStarExpanded / numberOfPlans,
+                                                       aStarSeconds / numberOfPlans * 1e3,
+                                                       aStarExpanded / numberOfPlans,
+                                                       aStarSeconds / max(dStarSeconds, 1e-9),
+                                                       mismatches))
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Compare D* Lite replanning with aStarAlgorithm from scratch")
+    parser.add_argument("maps", nargs="+", help="map files, same format as navig1.txt")
+    parser.add_argument("--changes", type=int, default=50, help="obstacle changes per map")
+    parser.add_argument("--size", type=int, default=4, help="largest width and height of a random obstacle")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args(arguments)
+    benchmark(arguments.maps, arguments.changes, arguments.size, arguments.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import heapq
+import numbers
+from collections import deque
+from itertools import count
+
+# Marks a heap entry that has been replaced by a newer one (lazy decrease-key)
+REMOVED = None
+
+
+# The default open list for aStarAlgorithm
+# Binary heap ordered on f = g + h, ties are broken on the lowest h and then on insertion order,
+# so the same map always gives the same search
+# With a weight above 1 the order is g + weight*h, like weighted A* and ARA* use
+class HeapFrontier:
+
+    def __init__(self, weight=1):
+        self.heap = []
+        self.entries = {}
+        self.counter = count()
+        self.weight = weight
+
+    def push(self, node):
+        entry = [node.g + self.weight * node.h, node.h, next(self.counter), node]
+        self.entries[id(node)] = entry
+        heapq.heappush(self.heap, entry)
+
+    # Called when a node already on the open list gets a better g
+    # The old entry is left in the heap and skipped when it is popped
+    def update(self, node):
+        entry = self.entries.pop(id(node), None)
+        if entry is not None:
+            entry[-1] = REMOVED
+        self.push(node)
+
+    def pop(self):
+        while self.heap:
+            node = heapq.heappop(self.heap)[-1]
+            if node is not REMOVED:
+                del self.entries[id(node)]
+                return node
+        raise IndexError("pop from an empty frontier")
+
+    # The lowest f on the open list, without popping the node (weighted, if the frontier is)
+    def getMinimumF(self):
+        while self.heap and self.heap[0][-1] is REMOVED:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return float("inf")
+        return self.heap[0][0]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# Open list for custom pop functions, e.g. open.pop(0) for bfs
+# The pop function gets the plain list, just like before
+class ListFrontier:
+
+    def __init__(self, pop):
+        self.nodes = []
+        self.popFunction = pop
+
+    def push(self, node):
+        self.nodes.append(node)
+
+    # The pop function looks at g and h itself, nothing to reorder
+    def update(self, node):
+        pass
+
+    def pop(self):
+        return self.popFunction(self.nodes)
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+def isWholeNumber(value):
+    return isinstance(value, numbers.Integral) or (isinstance(value, float) and value.is_integer())
+
+
+# Open list for integer f values, e.g. unit arc costs and Manhattan distance
+# One bucket per f, and inside it one queue per h, so push and pop do not depend on the number of nodes.
+# Nodes come out in the same order as from HeapFrontier: lowest f, then lowest h, then insertion order
+# The buckets are searched one f and one h at a time, so push raises ValueError for an f or h that is not
+# a whole number, inf included
+class BucketFrontier:
+
+    def __init__(self):
+        # f -> [lowest h that may have a node, h -> queue of entries]
+        self.buckets = {}
+        self.entries = {}
+        # No bucket below this f has a node in it
+        self.minimumF = None
+
+    def push(self, node):
+        f = node.g + node.h
+        if not isWholeNumber(f) or not isWholeNumber(node.h):
+            raise ValueError("BucketFrontier needs whole numbers for f and h, got f = %r and h = %r" % (f, node.h))
+        entry = [node]
+        self.entries[id(node)] = entry
+
+        bucket = self.buckets.get(f)
+        if bucket is None:
+            bucket = self.buckets[f] = [node.h, {}]
+        elif node.h < bucket[0]:
+            bucket[0] = node.h
+        queues = bucket[1]
+        if node.h not in queues:
+            queues[node.h] = deque()
+        queues[node.h].append(entry)
+
+        if self.minimumF is None or f < self.minimumF:
+            self.minimumF = f
+
+    # Same lazy replacement as HeapFrontier
+    def update(self, node):
+        entry = self.entries.pop(id(node), None)
+        if entry is not None:
+            entry[-1] = REMOVED
+        self.push(node)
+
+    # Moves minimumF and the lowest h of its bucket to the best live entry, returns its queue
+    def findBest(self):
+        while self.entries:
+            bucket = self.buckets.get(self.minimumF)
+            if bucket is None or not bucket[1]:
+                self.buckets.pop(self.minimumF, None)
+                self.minimumF += 1
+                continue
+            queues = bucket[1]
+            entries = queues.get(bucket[0])
+            if entries is None:
+                bucket[0] += 1
+                continue
+            if entries[0][-1] is REMOVED:
+                entries.popleft()
+                if not entries:
+                    del queues[bucket[0]]
+                continue
+            return entries
+        return None
+
+    def pop(self):
+        entries = self.findBest()
+        if entries is None:
+            raise IndexError("pop from an empty frontier")
+        node = entries.popleft()[-1]
+        if not entries:
+            del self.buckets[self.minimumF][1][node.h]
+        del self.entries[id(node)]
+        return node
+
+    def getMinimumF(self):
+        if self.findBest() is None:
+            return float("inf")
+        return self.minimumF
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# First in, first out, for breadth first search
+class FifoFrontier:
+
+    def __init__(self):
+        self.nodes = deque()
+
+    def push(self, node):
+        self.nodes.append(node)
+
+    # The order does not depend on g or h
+    def update(self, node):
+        pass
+
+    def pop(self):
+        return self.nodes.popleft()
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+# Last in, first out, for depth first search
+class LifoFrontier:
+
+    def __init__(self):
+        self.nodes = []
+
+    def push(self, node):
+        self.nodes.append(node)
+
+    # The order does not depend on g or h
+    def update(self, node):
+        pass
+
+    def pop(self):
+        return self.nodes.pop()
+
+    def __len__(self):
+        return len(self.nodes)
@@ -0,0 +1,150 @@
+import heapq
+from array import array
+from itertools import count
+
+from Module1 import board
+from Module1.node import Node
+from Module1.aStarProgram import getSolutionPathLength, printSearchStats, saveSearchStats
+
+UNSEEN = 0
+OPEN = 1
+CLOSED = 2
+
+
+# Read-only Node for a cell of a GridSearch
+# The parent is looked up in the arrays when asked for, so paintBoard and the
+# solution path counting can walk the path without Node objects being stored
+class GridNode(Node):
+    __slots__ = ("search", "cell")
+
+    def __init__(self, search, cell):
+        self.search = search
+        self.cell = cell
+        self.x, self.y = divmod(cell, search.height)
+        self.g = search.g[cell]
+        self.h = search.h[cell]
+
+    @property
+    def parent(self):
+        parentCell = self.search.parent[self.cell]
+        if parentCell < 0:
+            return None
+        return GridNode(self.search, parentCell)
+
+
+# A* on the board, with the search state in flat arrays indexed by cell id (x*height + y)
+# Nodes are only created for paint and for the returned goal
+class GridSearch:
+
+    def __init__(self, width, height, obstacles):
+        self.width = width
+        self.height = height
+        self.obstacles = obstacles
+
+        numberOfCells = width * height
+        self.g = array("d", [-1]) * numberOfCells
+        self.h = array("d", [0]) * numberOfCells
+        self.parent = array("i", [-1]) * numberOfCells
+        self.status = bytearray(numberOfCells)
+
+    # The cells next to this one that are inside the board and not an obstacle
+    def getSurroundingCells(self, cell):
+        height = self.height
+        isBlocked = self.obstacles.isBlocked
+        surroundingCells = []
+
+        y = cell % height
+        if cell >= height and not isBlocked(cell - height):
+            surroundingCells.append(cell - height)
+        if cell < len(self.status) - height and not isBlocked(cell + height):
+            surroundingCells.append(cell + height)
+        if y > 0 and not isBlocked(cell - 1):
+            surroundingCells.append(cell - 1)
+        if y < height - 1 and not isBlocked(cell + 1):
+            surroundingCells.append(cell + 1)
+        return surroundingCells
+
+    # Same as aStarAlgorithm, h_func and arcCost get Node objects that are reused between calls
+    def aStar(self, startX, startY, goalX, goalY, h_func, paint, arcCost=None, stats=None):
+        height = self.height
+        g = self.g
+        h = self.h
+        parent = self.parent
+        status = self.status
+
+        probe = Node(0, 0)
+        probeFrom = Node(0, 0)
+
+        def heuristic(cell):
+            probe.x, probe.y = divmod(cell, height)
+            return h_func(probe)
+
+        def cost(fromCell, toCell):
+            probeFrom.x, probeFrom.y = divmod(fromCell, height)
+            probe.x, probe.y = divmod(toCell, height)
+            return arcCost(probeFrom, probe)
+
+        start = startX * height + startY
+        goal = goalX * height + goalY
+
+        # Ties are broken on the lowest h, then on insertion order
+        counter = count()
+        heap = []
+
+        g[start] = 0
+        h[start] = heuristic(start)
+        status[start] = OPEN
+        heapq.heappush(heap, (h[start], h[start], next(counter), start))
+
+        # Counters to display at the end
+        numberOfNodesGenerated = 1
+        numberOfNodesExpanded = 0
+
+        while heap:
+            f, kidH, tieBreak, cell = heapq.heappop(heap)
+            # Entries left behind when a cell got a better g
+            if status[cell] != OPEN or f != g[cell] + h[cell]:
+                continue
+
+            status[cell] = CLOSED
+            numberOfNodesExpanded = numberOfNodesExpanded + 1
+
+            if cell == start:
+                paint(Node.startNode)
+            else:
+                paint(GridNode(self, cell))
+
+            if cell == goal:
+                goalNode = GridNode(self, cell)
+                numberOfNodesInSolutionPath = getSolutionPathLength(goalNode)
+                printSearchStats("Grid A*", numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+                saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+                return goalNode
+
+            for kid in self.getSurroundingCells(cell):
+                if arcCost is None:
+                    kidG = g[cell] + 1
+                else:
+                    kidG = g[cell] + cost(cell, kid)
+
+                if status[kid] == UNSEEN:
+                    h[kid] = heuristic(kid)
+                    numberOfNodesGenerated += 1
+                elif kidG >= g[kid]:
+                    continue
+
+                # New cell, or a better path to an open or closed one
+                g[kid] = kidG
+                parent[kid] = cell
+                status[kid] = OPEN
+                heapq.heappush(heap, (kidG + h[kid], h[kid], next(counter), kid))
+
+        print("No goal found")
+        saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, None)
+        return None
+
+
+# Grid A* on the current board, from Node.startNode to Node.goalX, Node.goalY
+def gridAStar(h_func, paint, arcCost=None, stats=None):
+    search = GridSearch(board.width, board.height, board.obstacles)
+    return search.aStar(Node.startNode.x, Node.startNode.y, Node.goalX, Node.goalY, h_func, paint, arcCost, stats)
@@ -0,0 +1,298 @@
+from collections import deque
+
+from Module1 import board
+from Module1.node import Node
+from Module1.aStarProgram import aStarAlgorithm, printSearchStats, saveSearchStats
+from Module1.wavefront import getNodePath
+
+# Hierarchical path-finding A* (HPA*) on the board
+#
+# The board is cut into square clusters. Where two clusters touch, every run of free cells on
+# both sides of the border gets one or two entrances. Entrances of the same cluster are linked
+# with the length of the shortest path between them inside the cluster, and entrances facing
+# each other across a border are linked with cost 1.
+# A query links start and goal to the entrances of their clusters, runs aStarAlgorithm on this
+# small abstract graph, and then fills in the path inside every cluster on the way.
+# The paths are close to, but not always, the shortest ones
+#
+# Cells are numbered x*height + y, like everywhere else on the board
+
+defaultClusterSize = 10
+
+# Runs of free cells along a border longer than this get an entrance at both ends, shorter ones one in the middle
+maxSingleEntranceLength = 6
+
+
+class ClusterGraph:
+
+    def __init__(self, width, height, obstacles, clusterSize=defaultClusterSize):
+        self.width = width
+        self.height = height
+        self.obstacles = obstacles
+        self.clusterSize = clusterSize
+        self.clustersX = (width + clusterSize - 1) // clusterSize
+        self.clustersY = (height + clusterSize - 1) // clusterSize
+
+        # Border (clusterX, clusterY, dx, dy) is between cluster (clusterX, clusterY) and (clusterX + dx, clusterY + dy)
+        # For each border, the pairs of cells facing each other
+        self.transitions = {}
+        # Entrance -> entrances across a border
+        self.interEdges = {}
+        # Cluster -> entrance -> entrance -> cost
+        self.intraEdges = {}
+
+        for border in self.getAllBorders():
+            self.buildBorder(border)
+        for clusterX in range(self.clustersX):
+            for clusterY in range(self.clustersY):
+                self.buildCluster((clusterX, clusterY))
+
+    def getCluster(self, cell):
+        x, y = divmod(cell, self.height)
+        return x // self.clusterSize, y // self.clusterSize
+
+    # Cells x0 <= x < x1, y0 <= y < y1
+    def getClusterBounds(self, cluster):
+        x0 = cluster[0] * self.clusterSize
+        y0 = cluster[1] * self.clusterSize
+        return x0, y0, min(x0 + self.clusterSize, self.width), min(y0 + self.clusterSize, self.height)
+
+    def getAllBorders(self):
+        borders = []
+        for clusterX in range(self.clustersX):
+            for clusterY in range(self.clustersY):
+                if clusterX < self.clustersX - 1:
+                    borders.append((clusterX, clusterY, 1, 0))
+                if clusterY < self.clustersY - 1:
+                    borders.append((clusterX, clusterY, 0, 1))
+        return borders
+
+    # The borders of a cluster with its neighbours
+    def getClusterBorders(self, cluster):
+        clusterX, clusterY = cluster
+        borders = []
+        if clusterX < self.clustersX - 1:
+            borders.append((clusterX, clusterY, 1, 0))
+        if clusterY < self.clustersY - 1:
+            borders.append((clusterX, clusterY, 0, 1))
+        if clusterX > 0:
+            borders.append((clusterX - 1, clusterY, 1, 0))
+        if clusterY > 0:
+            borders.append((clusterX, clusterY - 1, 0, 1))
+        return borders
+
+    def isFree(self, cell):
+        return not self.obstacles.isBlocked(cell)
+
+    # Finds the entrances of a border
+    # Returns True if they changed, then the clusters on both sides have to be built again
+    def buildBorder(self, border):
+        clusterX, clusterY, dx, dy = border
+        x0, y0, x1, y1 = self.getClusterBounds((clusterX, clusterY))
+        height = self.height
+
+        # The cells on this side of the border, the cell on the other side is one step further
+        if dx:
+            cells = [(x1 - 1) * height + y for y in range(y0, y1)]
+            step = height
+        else:
+            cells = [x * height + y1 - 1 for x in range(x0, x1)]
+            step = 1
+
+        transitions = []
+        run = []
+        for cell in cells + [None]:
+            if cell is not None and self.isFree(cell) and self.isFree(cell + step):
+                run.append(cell)
+                continue
+            if len(run) > maxSingleEntranceLength:
+                transitions.append((run[0], run[0] + step))
+                transitions.append((run[-1], run[-1] + step))
+            elif run:
+                middle = run[len(run) // 2]
+                transitions.append((middle, middle + step))
+            run = []
+
+        oldTransitions = self.transitions.get(border, [])
+        if transitions == oldTransitions:
+            return False
+
+        for cell, otherCell in oldTransitions:
+            self.removeInterEdge(cell, otherCell)
+            self.removeInterEdge(otherCell, cell)
+        for cell, otherCell in transitions:
+            self.interEdges.setdefault(cell, set()).add(otherCell)
+            self.interEdges.setdefault(otherCell, set()).add(cell)
+        if transitions:
+            self.transitions[border] = transitions
+        else:
+            del self.transitions[border]
+        return True
+
+    def removeInterEdge(self, cell, otherCell):
+        edges = self.interEdges[cell]
+        edges.discard(otherCell)
+        if not edges:
+            del self.interEdges[cell]
+
+    def getEntrances(self, cluster):
+        entrances = set()
+        for border in self.getClusterBorders(cluster):
+            for transition in self.transitions.get(border, []):
+                for cell in transition:
+                    if self.getCluster(cell) == cluster:
+                        entrances.add(cell)
+        return entrances
+
+    # Breadth first search that stays inside the cluster
+    # Returns the distance and the previous cell of every cell reached
+    def searchCluster(self, source, cluster):
+        x0, y0, x1, y1 = self.getClusterBounds(cluster)
+        height = self.height
+        distances = {source: 0}
+        parents = {source: None}
+        queue = deque([source])
+        while queue:
+            cell = queue.popleft()
+            x, y = divmod(cell, height)
+            for kid, inside in ((cell - height, x > x0), (cell + height, x < x1 - 1),
+                                (cell - 1, y > y0), (cell + 1, y < y1 - 1)):
+                if inside and kid not in distances and self.isFree(kid):
+                    distances[kid] = distances[cell] + 1
+                    parents[kid] = cell
+                    queue.append(kid)
+        return distances, parents
+
+    # Links every entrance of the cluster to the ones it can reach inside it
+    def buildCluster(self, cluster):
+        entrances = self.getEntrances(cluster)
+        edges = {}
+        for entrance in entrances:
+            distances = self.searchCluster(entrance, cluster)[0]
+            edges[entrance] = {other: distances[other] for other in entrances
+                               if other != entrance and other in distances}
+        self.intraEdges[cluster] = edges
+
+    # Obstacle listener, builds the clusters under the rectangle again
+    # and the neighbours whose entrances moved
+    def updateRegion(self, startX, startY, width, height):
+        x0 = max(startX, 0)
+        y0 = max(startY, 0)
+        x1 = min(startX + width, self.width)
+        y1 = min(startY + height, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        changedClusters = set()
+        for clusterX in range(x0 // self.clusterSize, (x1 - 1) // self.clusterSize + 1):
+            for clusterY in range(y0 // self.clusterSize, (y1 - 1) // self.clusterSize + 1):
+                changedClusters.add((clusterX, clusterY))
+
+        for cluster in list(changedClusters):
+            for border in self.getClusterBorders(cluster):
+                if self.buildBorder(border):
+                    changedClusters.add((border[0], border[1]))
+                    changedClusters.add((border[0] + border[2], border[1] + border[3]))
+
+        for cluster in changedClusters:
+            self.buildCluster(cluster)
+
+    # HPA* from startX, startY to Node.goalX, Node.goalY
+    # Returns the goal node with every cell of the path in its parent chain, or None
+    def search(self, startX, startY, paint, stats=None):
+        height = self.height
+        start = startX * height + startY
+        goal = Node.goalX * height + Node.goalY
+
+        # Start and goal are linked to the entrances of their clusters for this query only
+        queryEdges = {start: {}}
+        startCluster = self.getCluster(start)
+        goalCluster = self.getCluster(goal)
+
+        distances = self.searchCluster(start, startCluster)[0]
+        for entrance in self.getEntrances(startCluster):
+            if entrance != start and entrance in distances:
+                queryEdges[start][entrance] = distances[entrance]
+        if goalCluster == startCluster and goal in distances:
+            queryEdges[start][goal] = distances[goal]
+
+        distances = self.searchCluster(goal, goalCluster)[0]
+        for entrance in self.getEntrances(goalCluster):
+            if entrance != goal and entrance in distances:
+                queryEdges.setdefault(entrance, {})[goal] = distances[entrance]
+
+        edgeCache = {}
+
+        def getEdges(cell):
+            edges = edgeCache.get(cell)
+            if edges is None:
+                edges = dict(self.intraEdges[self.getCluster(cell)].get(cell, {}))
+                for otherCell in self.interEdges.get(cell, ()):
+                    edges[otherCell] = 1
+                edges.update(queryEdges.get(cell, {}))
+                edgeCache[cell] = edges
+            return edges
+
+        def getAbstractNeighbours(node):
+            return [Node(*divmod(cell, height)) for cell in getEdges(node.x * height + node.y)]
+
+        def abstractCost(node1, node2):
+            return getEdges(node1.x * height + node1.y)[node2.x * height + node2.y]
+
+        searchStats = {}
+        abstractGoal = aStarAlgorithm(getAbstractNeighbours, board.manhattenDistToGoalNode, Node(startX, startY), paint,
+                                      arcCost=abstractCost, stats=searchStats, quiet=True)
+
+        if searchStats["pathLength"] is None:
+            print("No goal found")
+            saveSearchStats(stats, searchStats["generated"], searchStats["expanded"], None)
+            return None
+
+        abstractPath = []
+        node = abstractGoal
+        while node is not None:
+            abstractPath.append(node.x * height + node.y)
+            node = node.parent
+        abstractPath.reverse()
+
+        path = self.refinePath(abstractPath)
+        goalNode = getNodePath(path, height)
+        printSearchStats("HPA*", searchStats["generated"], searchStats["expanded"], len(path))
+        saveSearchStats(stats, searchStats["generated"], searchStats["expanded"], len(path))
+        return goalNode
+
+    # Fills in the cells between the abstract nodes, two of them are either
+    # on both sides of a border or in the same cluster
+    def refinePath(self, abstractPath):
+        path = [abstractPath[0]]
+        for cell, nextCell in zip(abstractPath, abstractPath[1:]):
+            if nextCell in self.interEdges.get(cell, ()):
+                path.append(nextCell)
+                continue
+
+            parents = self.searchCluster(cell, self.getCluster(cell))[1]
+            steps = []
+            step = nextCell
+            while step != cell:
+                steps.append(step)
+                step = parents[step]
+            steps.reverse()
+            path.extend(steps)
+        return path
+
+
+clusterGraph = None
+
+
+# The cluster graph of the current board, kept up to date with createObstacle
+def getClusterGraph(clusterSize=defaultClusterSize):
+    global clusterGraph
+    if clusterGraph is None or clusterGraph.obstacles is not board.obstacles or clusterGraph.clusterSize != clusterSize:
+        clusterGraph = ClusterGraph(board.width, board.height, board.obstacles, clusterSize)
+        board.addObstacleListener(clusterGraph.updateRegion)
+    return clusterGraph
+
+
+# HPA* from Node.startNode to Node.goalX, Node.goalY
+def hpaAStar(paint, clusterSize=defaultClusterSize, stats=None):
+    return getClusterGraph(clusterSize).search(Node.startNode.x, Node.startNode.y, paint, stats)
@@ -0,0 +1,126 @@
+from Module1.board import isWalkable
+from Module1.node import Node
+from Module1.aStarProgram import aStarAlgorithm, printSearchStats, saveSearchStats
+
+# Jump point search for the 4-connected board, run by aStarAlgorithm
+#
+# Of all the equally short paths only the ones that go horizontally first are searched:
+# - moving horizontally, every cell looks up and down for something interesting
+# - moving vertically, the search only stops at the goal or at a forced neighbour,
+#   a free cell to the side that could not be reached from the cell behind
+# Only the cells where the search stops (jump points) become nodes, so the open areas
+# of the board are crossed without expanding every cell in them
+
+allDirections = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+def isGoalCell(x, y):
+    return x == Node.goalX and y == Node.goalY
+
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+# Moves vertically from x, y until the goal or a forced neighbour
+# Returns the jump point, or None if the search runs into a wall
+def jumpVertical(x, y, dy):
+    while True:
+        y += dy
+        if not isWalkable(x, y):
+            return None
+        if isGoalCell(x, y):
+            return x, y
+        for sideX in (x - 1, x + 1):
+            if isWalkable(sideX, y) and not isWalkable(sideX, y - dy):
+                return x, y
+
+
+# Moves horizontally from x, y, and looks up and down from every cell on the way
+def jumpHorizontal(x, y, dx):
+    while True:
+        x += dx
+        if not isWalkable(x, y):
+            return None
+        if isGoalCell(x, y):
+            return x, y
+        if jumpVertical(x, y, 1) is not None or jumpVertical(x, y, -1) is not None:
+            return x, y
+
+
+# The directions worth searching from this node, given the direction it was reached from
+def getPrunedDirections(node):
+    if node.parent is None:
+        return allDirections
+
+    dx = sign(node.x - node.parent.x)
+    dy = sign(node.y - node.parent.y)
+
+    if dx != 0:
+        return [(dx, 0), (0, 1), (0, -1)]
+
+    directions = [(0, dy)]
+    for sideDx in (-1, 1):
+        if isWalkable(node.x + sideDx, node.y) and not isWalkable(node.x + sideDx, node.y - dy):
+            directions.append((sideDx, 0))
+    return directions
+
+
+# getNeighbours for aStarAlgorithm, the successors are the next jump points
+def getJumpPoints(node):
+    jumpPoints = []
+    for dx, dy in getPrunedDirections(node):
+        if dx != 0:
+            jumpPoint = jumpHorizontal(node.x, node.y, dx)
+        else:
+            jumpPoint = jumpVertical(node.x, node.y, dy)
+        if jumpPoint is not None:
+            jumpPoints.append(Node(jumpPoint[0], jumpPoint[1]))
+    return jumpPoints
+
+
+# Jump points are on a straight line from their parent
+def jumpCost(node1, node2):
+    return abs(node1.x - node2.x) + abs(node1.y - node2.y)
+
+
+# Fills in the cells between the jump points, so the path can be painted and counted like any other
+# Returns the new goal node
+def expandJumpPath(goalNode):
+    jumpPoints = []
+    node = goalNode
+    while node is not None:
+        jumpPoints.append(node)
+        node = node.parent
+    jumpPoints.reverse()
+
+    node = jumpPoints[0]
+    for jumpPoint in jumpPoints[1:]:
+        dx = sign(jumpPoint.x - node.x)
+        dy = sign(jumpPoint.y - node.y)
+        while node.x != jumpPoint.x or node.y != jumpPoint.y:
+            step = Node(node.x + dx, node.y + dy)
+            step.parent = node
+            step.g = node.g + 1
+            step.h = 0
+            node = step
+    return node
+
+
+# Jump point search from Node.startNode to Node.goalX, Node.goalY
+# Returns the goal node with every cell of the path in its parent chain, or None
+def jpsAStar(h_func, paint, stats=None):
+    searchStats = {}
+    goalNode = aStarAlgorithm(getJumpPoints, h_func, Node.startNode, paint,
+                              arcCost=jumpCost, stats=searchStats, quiet=True)
+
+    if searchStats["pathLength"] is None:
+        print("No goal found")
+        saveSearchStats(stats, searchStats["generated"], searchStats["expanded"], None)
+        return None
+
+    goalNode = expandJumpPath(goalNode)
+    numberOfNodesInSolutionPath = goalNode.g + 1
+    printSearchStats("Jump point search", searchStats["generated"], searchStats["expanded"], numberOfNodesInSolutionPath)
+    saveSearchStats(stats, searchStats["generated"], searchStats["expanded"], numberOfNodesInSolutionPath)
+    return goalNode
@@ -0,0 +1,132 @@
+import hashlib
+import os
+
+import numpy as np
+
+from Module1 import board
+from Module1.node import Node
+from Module1.wavefront import UNREACHABLE, getWalkableCells, getDistanceMap
+
+# Landmark (ALT) heuristic for many queries on the same map
+# A few landmark cells are picked once, and the exact distance from each of them to every cell is stored.
+# By the triangle inequality |d(L, goal) - d(L, node)| is never more than the distance from node to goal,
+# so the largest of these over all landmarks is an admissible heuristic, and a lot better than
+# Manhattan distance behind large obstacles
+#
+# The tables are saved next to the map file, and only used again if the obstacles are the same
+
+defaultNumberOfLandmarks = 8
+
+
+# Hash of the size and obstacles of the board, start and goal are left out
+def getMapHash(width, height, obstacles):
+    mapHash = hashlib.sha1()
+    mapHash.update(("%d %d " % (width, height)).encode())
+    mapHash.update(bytes(obstacles.bits))
+    return mapHash.hexdigest()
+
+
+# navig1.txt -> navig1.landmarks.npz
+def getLandmarkFile(mapPath):
+    return os.path.splitext(mapPath)[0] + ".landmarks.npz"
+
+
+class LandmarkTables:
+
+    # distances has one row per cell, with the distance to each landmark in it
+    def __init__(self, mapHash, landmarks, distances):
+        self.mapHash = mapHash
+        self.landmarks = landmarks
+        self.distances = distances
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            np.savez(f, mapHash=np.array(self.mapHash), landmarks=self.landmarks, distances=self.distances)
+
+    @staticmethod
+    def load(path):
+        with np.load(path, allow_pickle=False) as data:
+            return LandmarkTables(str(data["mapHash"]), data["landmarks"], data["distances"])
+
+
+# Farthest point selection: every new landmark is the cell farthest away from the landmarks picked so far
+# Cells no landmark can reach count as infinitely far, so closed off parts of the map get a landmark too
+def selectLandmarks(width, height, obstacles, numberOfLandmarks=defaultNumberOfLandmarks):
+    walkable = getWalkableCells(width, height, obstacles)
+    landmarks = []
+    tables = []
+    if not walkable.any():
+        return LandmarkTables(getMapHash(width, height, obstacles),
+                              np.array(landmarks, dtype=np.int64),
+                              np.zeros((width * height, 0), dtype=np.int32))
+
+    # The first landmark is the cell farthest from the first free cell
+    distances = getDistanceMap(walkable, width, height, int(np.argmax(walkable)))[0]
+    landmark = int(np.argmax(distances))
+
+    farAway = width * height
+    minimumDistance = np.where(walkable, farAway, UNREACHABLE)
+    while len(landmarks) < numberOfLandmarks:
+        distances = getDistanceMap(walkable, width, height, landmark)[0]
+        landmarks.append(landmark)
+        tables.append(distances)
+
+        reached = distances != UNREACHABLE
+        minimumDistance[reached] = np.minimum(minimumDistance[reached], distances[reached])
+        landmark = int(np.argmax(minimumDistance))
+        # Every free cell is a landmark already
+        if minimumDistance[landmark] <= 0:
+            break
+
+    return LandmarkTables(getMapHash(width, height, obstacles),
+                          np.array(landmarks, dtype=np.int64),
+                          np.ascontiguousarray(np.stack(tables, axis=1)))
+
+
+# The tables of the board that is loaded from mapPath
+# Saved tables are used if they belong to the same obstacles, if not they are made and saved
+def loadLandmarks(mapPath, numberOfLandmarks=defaultNumberOfLandmarks):
+    mapHash = getMapHash(board.width, board.height, board.obstacles)
+    landmarkFile = getLandmarkFile(mapPath)
+
+    if os.path.exists(landmarkFile):
+        try:
+            tables = LandmarkTables.load(landmarkFile)
+        except (OSError, ValueError, KeyError):
+            tables = None
+        if tables is not None and tables.mapHash == mapHash and len(tables.landmarks) >= numberOfLandmarks:
+            return tables
+
+    tables = selectLandmarks(board.width, board.height, board.obstacles, numberOfLandmarks)
+    tables.save(landmarkFile)
+    return tables
+
+
+# h_func for aStarAlgorithm, towards Node.goalX, Node.goalY on the current board
+# Never lower than Manhattan distance. If a landmark reaches only one of node and goal,
+# there is no path between them and h is infinite
+def altHeuristic(tables):
+    distances = tables.distances
+    height = board.height
+    goalCell = None
+    goalDistances = None
+
+    def h_func(node):
+        nonlocal goalCell, goalDistances
+        xDist = abs(node.x - Node.goalX)
+        yDist = abs(node.y - Node.goalY)
+
+        cell = Node.goalX * height + Node.goalY
+        if cell != goalCell:
+            goalCell = cell
+            goalDistances = distances[cell].tolist()
+
+        h = xDist + yDist
+        for goalDistance, nodeDistance in zip(goalDistances, distances[node.x * height + node.y].tolist()):
+            if (goalDistance == UNREACHABLE) != (nodeDistance == UNREACHABLE):
+                return float("inf")
+            if abs(goalDistance - nodeDistance) > h:
+                h = abs(goalDistance - nodeDistance)
+        return h
+
+    return h_func
@@ -1,6 +1,18 @@
 from Module1.board import *
 from time import sleep
-from Module1.aStarProgram import aStarAlgorithm
+from Module1.aStarProgram import aStarAlgorithm, zeroHeuristic
+from Module1.gridSearch import gridAStar
+from Module1.jumpPointSearch import jpsAStar
+from Module1.bidirectionalProgram import bidirectionalGridAStar
+from Module1.wavefront import wavefrontBFS
+from Module1.landmarks import loadLandmarks, altHeuristic
+from Module1.hierarchical import hpaAStar
+from Module1.visibilityGraph import visibilityGraphAStar
+from Module1.contractionHierarchy import loadContractionHierarchy, contractionHierarchySearch
+from Module1.anytimeProgram import araStarAlgorithm
+from Module1.dStarLite import dStarLiteSearch
+from Module1.terrain import loadTerrainBoard, terrainAStar
+from Module1.frontier import BucketFrontier, LifoFrontier
 
 delaytime = 0
 # Paints the board
@@ -47,15 +59,20 @@ def paintBoard(t):
                 lastpaint[x * height + y] = "shortdrawn"
 
 
-possibleModes = ["astar", "bfs", "dfs"]
+# Anytime search reports every better path it finds
+def printSolution(goalNode, bound):
+    print("Path of cost", goalNode.g, "found, at most", round(bound, 3), "times the shortest")
+
+
+possibleModes = ["astar", "bfs", "dfs", "grid", "jps", "bidirectional", "alt", "hpa", "visibility", "ch", "ara", "dstar", "terrain"]
 possibleDelay = {"fast": 0.02, "slow": 0.1}
 
 while True:
 
     # Get input from the user which mode to use
-    mode = input("Specify mode, one of [Astar, BFS, DFS]: ").lower()
+    mode = input("Specify mode, one of [Astar, BFS, DFS, Grid, JPS, Bidirectional, ALT, HPA, Visibility, CH, ARA, DStar, Terrain]: ").lower()
     while mode not in possibleModes:
-        mode = input("Wrong input, specify one of [Astar, BFS, DFS]: ").lower()
+        mode = input("Wrong input, specify one of [Astar, BFS, DFS, Grid, JPS, Bidirectional, ALT, HPA, Visibility, CH, ARA, DStar, Terrain]: ").lower()
 
     # Get input from the user which file to use
     while True:
@@ -73,41 +90,54 @@ while True:
 
     delaytime = possibleDelay[delaymode]
 
-    width, height = [int(i) for i in f.readline().split()]
-    setDimensions(width, height)
-
-    createBoard()
-
-    startAndGoal = [int(i) for i in f.readline().split()]
-    createStart(startAndGoal[0], startAndGoal[1])
-    createGoal(startAndGoal[2], startAndGoal[3])
-
-    block = f.readline()
-    while block != '':
-        block = [int(i) for i in block.split()]
-        createObstacle(block[0], block[1], block[2], block[3])
-        block = f.readline()
-
+    # Terrain boards are the weighted boards of Old/Eclipse/Oving3_AI, see terrain
+    if mode == "terrain":
+        width, height = loadTerrainBoard(f)
+    else:
+        width, height = loadBoard(f)
     f.close()
 
     lastpaint = [None] * (width * height)
 
-    mPop = None
+    # Unit arc costs and Manhattan distance give integer f values, so a bucket queue works
+    mFrontier = BucketFrontier()
     mHfunc = manhattenDistToGoalNode
 
-    # Define custom functions if dfs or bfs
+    # Define custom functions if dfs or alt
     if mode == "dfs":
-        def mPop(open):
-            return open.pop()
-        def mHfunc(node):
-            return 0
-    elif mode == "bfs":
-        def mPop(open):
-            return open.pop(0)
-        def mHfunc(node):
-            return 0
-
-    aStarAlgorithm(getSurroundingTiles, mHfunc, Node.startNode, paintBoard, pop=mPop)
+        mFrontier = LifoFrontier()
+        mHfunc = zeroHeuristic
+    elif mode == "alt":
+        # Infinite h for cells cut off from the goal, so not for the bucket queue
+        mFrontier = None
+        mHfunc = altHeuristic(loadLandmarks(prompt + ".txt"))
+
+    # Grid is A* without Node objects, see gridSearch
+    # BFS is a wavefront over the whole board, see wavefront
+    if mode == "bfs":
+        wavefrontBFS(paintBoard)
+    elif mode == "grid":
+        gridAStar(mHfunc, paintBoard)
+    elif mode == "jps":
+        jpsAStar(mHfunc, paintBoard)
+    elif mode == "bidirectional":
+        bidirectionalGridAStar(getSurroundingTiles, paintBoard)
+    elif mode == "hpa":
+        hpaAStar(paintBoard)
+    elif mode == "visibility":
+        visibilityGraphAStar(paintBoard)
+    elif mode == "ch":
+        contractionHierarchySearch(loadContractionHierarchy(prompt + ".txt"), paintBoard)
+    elif mode == "ara":
+        araStarAlgorithm(getSurroundingTiles, mHfunc, Node.startNode, paintBoard, onSolution=printSolution)
+    elif mode == "dstar":
+        dStarLiteSearch(paintBoard)
+    elif mode == "terrain":
+        terrainAStar(paintBoard)
+    else:
+        # Manhattan distance and the landmark bounds are consistent, depth first search gets no such promise
+        aStarAlgorithm(getSurroundingTiles, mHfunc, Node.startNode, paintBoard, frontier=mFrontier,
+                       consistent=mode != "dfs")
     getWindow().getMouse()
     getWindow().close()
 
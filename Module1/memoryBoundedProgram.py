@@ -0,0 +1,360 @@
+import heapq
+import sys
+from itertools import count
+
+from Module1.aStarProgram import getSolutionPathLength, printSearchStats, saveSearchStats, unitArcCost
+
+# Memory bounded alternatives to aStarAlgorithm, with the same getNeighbours, h_func and arcCost callbacks
+# idaStarAlgorithm keeps the current path and a table of the best g of each state,
+# smaStarAlgorithm keeps at most a given number of nodes
+
+
+# Iterative deepening A*
+# Depth first searches with a growing limit on f
+# States on the current path are skipped, to stop the search from walking in circles
+# The transposition table keeps the best g of every state expanded in the current iteration, a state reached
+# again without a better g is skipped. Without it grids blow up, every cell is reached along many paths
+# maxNodes limits the number of states in the table, maxBytes does the same based on the size of the key of
+# initialState. When the table is full new states are not added, and are searched again along every path
+def idaStarAlgorithm(getNeighbours,
+                     h_func,
+                     initialState,
+                     paint,
+                     arcCost=None,
+                     maxNodes=None,
+                     maxBytes=None,
+                     stats=None,
+                     quiet=False):
+
+    if arcCost is None:
+        arcCost = unitArcCost
+
+    if maxBytes is not None:
+        bytesPerEntry = getStateSize(initialState.key()) + sys.getsizeof(0.0)
+        byteLimit = maxBytes // bytesPerEntry
+        maxNodes = byteLimit if maxNodes is None else min(maxNodes, byteLimit)
+    if maxNodes is None:
+        maxNodes = float("inf")
+
+    initialState.g = 0
+    initialState.h = h_func(initialState)
+    initialState.parent = None
+
+    # Counters to display at the end
+    numberOfNodesGenerated = 1
+    numberOfNodesExpanded = 0
+
+    threshold = initialState.h
+    while True:
+        nextThreshold = float("inf")
+
+        # The path from the root, with the kids of each node that are left to try
+        stack = [(initialState, initialState.key(), None)]
+        onPath = {initialState.key()}
+        bestG = {}
+
+        while stack:
+            node, key, kidsLeft = stack[-1]
+
+            # First visit of the node
+            if kidsLeft is None:
+                f = node.g + node.h
+                if f > threshold:
+                    nextThreshold = min(nextThreshold, f)
+                    stack.pop()
+                    onPath.discard(key)
+                    continue
+
+                numberOfNodesExpanded = numberOfNodesExpanded + 1
+                paint(node)
+                if key in bestG or len(bestG) < maxNodes:
+                    bestG[key] = node.g
+
+                if node.isGoal():
+                    numberOfNodesInSolutionPath = getSolutionPathLength(node)
+                    if not quiet:
+                        printSearchStats("IDA*", numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+                    saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+                    return node
+
+                kids = []
+                for kid in getNeighbours(node):
+                    kid.parent = node
+                    kid.g = node.g + arcCost(node, kid)
+                    kid.h = h_func(kid)
+                    kids.append(kid)
+                    numberOfNodesGenerated += 1
+
+                # Best kid last, it is popped first
+                kids.sort(key=lambda kid: kid.g + kid.h, reverse=True)
+                stack[-1] = (node, key, kids)
+                continue
+
+            if not kidsLeft:
+                stack.pop()
+                onPath.discard(key)
+                continue
+
+            kid = kidsLeft.pop()
+            kidKey = kid.key()
+            if kidKey in onPath or bestG.get(kidKey, float("inf")) <= kid.g:
+                continue
+            onPath.add(kidKey)
+            stack.append((kid, kidKey, None))
+
+        if nextThreshold == float("inf"):
+            if not quiet:
+                print("No goal found")
+            saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, None)
+            return initialState
+
+        threshold = nextThreshold
+
+
+# A node in the memory of SMA*
+# kids are the successors in memory, by their position in getNeighbours(state)
+# forgotten holds the backed up f of successors that were dropped, and inf for dead ends
+class SmaNode:
+    __slots__ = ("state", "key", "parent", "index", "depth", "f", "kids", "forgotten", "numberOfKids", "stamp")
+
+    def __init__(self, state, key, parent, index, depth, f):
+        self.state = state
+        self.key = key
+        self.parent = parent
+        self.index = index
+        self.depth = depth
+        self.f = f
+        self.kids = {}
+        self.forgotten = {}
+        self.numberOfKids = None
+        self.stamp = 0
+
+    # Expanded, and every successor is either in memory or a dead end
+    def isComplete(self):
+        if self.numberOfKids is None:
+            return False
+        for index in range(self.numberOfKids):
+            if index not in self.kids and self.forgotten.get(index) != float("inf"):
+                return False
+        return True
+
+    def isLeaf(self):
+        return len(self.kids) == 0
+
+    def getBackedUpF(self):
+        bestF = float("inf")
+        for kid in self.kids.values():
+            bestF = min(bestF, kid.f)
+        for f in self.forgotten.values():
+            bestF = min(bestF, f)
+        return bestF
+
+
+# Rough size in bytes of a state, without the states it links to through parent
+def getStateSize(state, seen=None):
+    if seen is None:
+        seen = set()
+    if id(state) in seen:
+        return 0
+    seen.add(id(state))
+
+    size = sys.getsizeof(state)
+    if isinstance(state, (str, bytes, int, float, bool)) or state is None:
+        return size
+    if isinstance(state, dict):
+        for key, value in state.items():
+            size += getStateSize(key, seen) + getStateSize(value, seen)
+        return size
+    if isinstance(state, (list, tuple, set, frozenset)):
+        for item in state:
+            size += getStateSize(item, seen)
+        return size
+
+    attributes = {}
+    if hasattr(state, "__dict__"):
+        attributes.update(vars(state))
+    for cls in type(state).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(state, name):
+                attributes[name] = getattr(state, name)
+    for name, value in attributes.items():
+        if name != "parent":
+            size += getStateSize(value, seen)
+    return size
+
+
+# Simplified memory bounded A*
+# A tree search like IDA*, states reached along different paths are not merged
+# Like A*, but when memory is full the leaf with the highest f is dropped, and its f is
+# remembered by its parent. The parent is searched again if that f becomes the best one
+# maxNodes limits the number of nodes in memory, maxBytes does the same based on the size of initialState
+# The path to the goal must fit in memory, deeper paths are treated as dead ends
+# All successors of a node are added at once, so memory can go over the limit by one branching factor
+def smaStarAlgorithm(getNeighbours,
+                     h_func,
+                     initialState,
+                     paint,
+                     arcCost=None,
+                     maxNodes=None,
+                     maxBytes=None,
+                     stats=None,
+                     quiet=False):
+
+    if arcCost is None:
+        arcCost = unitArcCost
+
+    if maxBytes is not None:
+        bytesPerNode = getStateSize(initialState) + sys.getsizeof(SmaNode(None, None, None, None, 0, 0))
+        byteLimit = max(2, maxBytes // bytesPerNode)
+        maxNodes = byteLimit if maxNodes is None else min(maxNodes, byteLimit)
+    if maxNodes is None:
+        maxNodes = float("inf")
+
+    infinity = float("inf")
+    counter = count()
+
+    # Best node: lowest f, deepest first. Worst node: highest f, shallowest first
+    # Entries are skipped when the stamp of the node has changed since they were pushed
+    bestHeap = []
+    worstHeap = []
+
+    def addToOpen(node):
+        node.stamp += 1
+        heapq.heappush(bestHeap, (node.f, -node.depth, next(counter), node.stamp, node))
+        heapq.heappush(worstHeap, (-node.f, node.depth, next(counter), node.stamp, node))
+
+    def removeFromOpen(node):
+        node.stamp += 1
+
+    def isInOpen(node, entry):
+        return entry[3] == node.stamp
+
+    def getBest():
+        while bestHeap and not isInOpen(bestHeap[0][-1], bestHeap[0]):
+            heapq.heappop(bestHeap)
+        if not bestHeap:
+            return None
+        return bestHeap[0][-1]
+
+    # Removes the worst leaf from memory, returns False if there is none
+    def forgetWorstLeaf():
+        skipped = []
+        forgottenLeaf = None
+        while worstHeap:
+            entry = heapq.heappop(worstHeap)
+            node = entry[-1]
+            if not isInOpen(node, entry):
+                continue
+            if node.parent is None or not node.isLeaf():
+                skipped.append(entry)
+                continue
+            forgottenLeaf = node
+            break
+        for entry in skipped:
+            heapq.heappush(worstHeap, entry)
+
+        if forgottenLeaf is None:
+            return False
+
+        removeFromOpen(forgottenLeaf)
+        parent = forgottenLeaf.parent
+        del parent.kids[forgottenLeaf.index]
+        parent.forgotten[forgottenLeaf.index] = forgottenLeaf.f
+        # The parent has a successor to generate again
+        addToOpen(parent)
+        return True
+
+    # Passes a better estimate up the tree, and drops nodes that turned out to be dead ends
+    def backUp(node):
+        nonlocal numberOfNodesInMemory
+        while node is not None:
+            newF = node.getBackedUpF()
+            if newF == node.f:
+                return
+            node.f = newF
+            if node.f == infinity and node.parent is not None:
+                removeFromOpen(node)
+                del node.parent.kids[node.index]
+                node.parent.forgotten[node.index] = infinity
+                numberOfNodesInMemory -= 1
+            elif node.isComplete():
+                removeFromOpen(node)
+            else:
+                addToOpen(node)
+            node = node.parent
+
+    initialState.g = 0
+    initialState.h = h_func(initialState)
+    initialState.parent = None
+    root = SmaNode(initialState, initialState.key(), None, None, 0, initialState.h)
+    addToOpen(root)
+
+    # Counters to display at the end
+    numberOfNodesGenerated = 1
+    numberOfNodesExpanded = 0
+    numberOfNodesForgotten = 0
+    numberOfNodesInMemory = 1
+
+    while True:
+        best = getBest()
+        if best is None or best.f == infinity:
+            if not quiet:
+                print("No goal found")
+            saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, None)
+            if stats is not None:
+                stats["forgotten"] = numberOfNodesForgotten
+            return initialState
+
+        state = best.state
+        if state.isGoal():
+            numberOfNodesInSolutionPath = getSolutionPathLength(state)
+            if not quiet:
+                printSearchStats("SMA*", numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+                print("Total number of search nodes forgotten: ", numberOfNodesForgotten)
+            saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+            if stats is not None:
+                stats["forgotten"] = numberOfNodesForgotten
+            return state
+
+        numberOfNodesExpanded = numberOfNodesExpanded + 1
+        paint(state)
+
+        # States on the path from the root are dead ends, to stop walking in circles
+        pathKeys = set()
+        ancestor = best
+        while ancestor is not None:
+            pathKeys.add(ancestor.key)
+            ancestor = ancestor.parent
+
+        successors = getNeighbours(state)
+        best.numberOfKids = len(successors)
+        for index, kid in enumerate(successors):
+            if index in best.kids or best.forgotten.get(index) == infinity:
+                continue
+
+            kid.parent = state
+            kid.g = state.g + arcCost(state, kid)
+            kid.h = h_func(kid)
+            kidKey = kid.key()
+            tooDeep = best.depth + 1 >= maxNodes - 1 and not kid.isGoal()
+            if kidKey in pathKeys or tooDeep:
+                best.forgotten[index] = infinity
+                continue
+
+            # f never drops below the f of the parent, and never below what was backed up before
+            f = max(best.f, kid.g + kid.h, best.forgotten.pop(index, 0))
+            kidNode = SmaNode(kid, kidKey, best, index, best.depth + 1, f)
+            best.kids[index] = kidNode
+            addToOpen(kidNode)
+            numberOfNodesGenerated += 1
+            numberOfNodesInMemory += 1
+
+        if best.isComplete():
+            removeFromOpen(best)
+        backUp(best)
+
+        while numberOfNodesInMemory > maxNodes:
+            if not forgetWorstLeaf():
+                break
+            numberOfNodesInMemory -= 1
+            numberOfNodesForgotten += 1
@@ -1,4 +1,5 @@
 class Node:
+    __slots__ = ("x", "y", "h", "g", "parent")
 
     # "static" variables to keep track of start and goal
     startNode = None
@@ -23,5 +24,12 @@ class Node:
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        return hash(self.key())
+
+    # Identifies the state, used by aStarAlgorithm to look up open and closed nodes
+    def key(self):
+        return (self.x, self.y)
+
     def isGoal(self):
         return self.x == Node.goalX and self.y == Node.goalY
\ No newline at end of file
@@ -0,0 +1,61 @@
+# Obstacles of the board, one bit per cell
+# Cell (x, y) is bit number x*height + y, the same numbering paintBoard uses
+class ObstacleGrid:
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.bits = bytearray((width * height + 7) // 8)
+        # The rectangles that were added, clipped to the board
+        self.rectangles = []
+
+    def cellId(self, x, y):
+        return x * self.height + y
+
+    def isObstacle(self, x, y):
+        i = x * self.height + y
+        return self.bits[i >> 3] & (1 << (i & 7)) != 0
+
+    # Same as isObstacle, but for a cell id
+    def isBlocked(self, i):
+        return self.bits[i >> 3] & (1 << (i & 7)) != 0
+
+    def add(self, x, y):
+        i = x * self.height + y
+        self.bits[i >> 3] |= 1 << (i & 7)
+
+    def remove(self, x, y):
+        i = x * self.height + y
+        self.bits[i >> 3] &= ~(1 << (i & 7))
+
+    # Cells outside the board are ignored
+    def addRectangle(self, startX, startY, width, height):
+        x0 = max(startX, 0)
+        y0 = max(startY, 0)
+        x1 = min(startX + width, self.width)
+        y1 = min(startY + height, self.height)
+        if x0 < x1 and y0 < y1:
+            self.rectangles.append((x0, y0, x1 - x0, y1 - y0))
+        for x in range(x0, x1):
+            for y in range(y0, y1):
+                self.add(x, y)
+
+    # Takes out a rectangle that was added before, cells another rectangle covers stay obstacles
+    # Returns False if there is no such rectangle
+    def removeRectangle(self, startX, startY, width, height):
+        x0 = max(startX, 0)
+        y0 = max(startY, 0)
+        x1 = min(startX + width, self.width)
+        y1 = min(startY + height, self.height)
+        if (x0, y0, x1 - x0, y1 - y0) not in self.rectangles:
+            return False
+        self.rectangles.remove((x0, y0, x1 - x0, y1 - y0))
+
+        for x in range(x0, x1):
+            for y in range(y0, y1):
+                self.remove(x, y)
+        for x, y, width, height in self.rectangles:
+            for otherX in range(max(x, x0), min(x + width, x1)):
+                for otherY in range(max(y, y0), min(y + height, y1)):
+                    self.add(otherX, otherY)
+        return True
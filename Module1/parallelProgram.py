@@ -0,0 +1,397 @@
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import traceback
+from queue import Empty
+from time import perf_counter
+
+from Module1 import board
+from Module1.node import Node
+from Module1.frontier import HeapFrontier
+from Module1.aStarProgram import aStarAlgorithm, getSolutionPathLength, printSearchStats, saveSearchStats, \
+    unitArcCost, noPaint
+from Module1.checkpoint import encodeNode, decodeNode
+
+# Hash distributed A* (HDA*), with the same getNeighbours, h_func, paint and arcCost callbacks as aStarAlgorithm
+#
+# Every state belongs to one worker process, hash(key) % number of workers. Each worker has its own open and
+# closed lists for its states. When a worker expands a state, the kids that belong to other workers are sent
+# to them in batches through multiprocessing queues, with g and the key of the parent. The owner decides if
+# the kid is new or has a better g, and computes h.
+# The kids are sent as encode(kid) and turned back into states with decode by their owner, like the codec of
+# Module1.checkpoint. For Module1 nodes encodeNode and decodeNode only send the key. Without a codec the
+# states themselves are pickled.
+#
+# The f of the best goal so far (the incumbent) is shared by all workers, they do not expand states with
+# f >= incumbent. That is the goal aStarAlgorithm would pop first, with h = 0 at goals it is the cost.
+# The search is over when every worker is idle (nothing left below the incumbent and nothing left to send)
+# and no batch is on its way. The coordinator checks that with probe waves: each worker answers
+# a probe with idle or not and its number of batches sent and received. Two waves in a row where everybody
+# is idle and the four sums are equal prove that no batch was on its way in between (four counter method),
+# so the incumbent is optimal. A worker tells the coordinator when it runs out of work, and the coordinator
+# waits for that before the next wave, so nobody polls.
+#
+# The path is put together afterwards: each worker knows the parent key of its states, the coordinator asks
+# the owner of the goal for the part of the path it holds, then the owner of the next key, and so on.
+#
+# The workers are forked, so the callbacks do not have to be pickled, but the encoded states and keys do.
+# Keys must hash the same in every worker, which fork gives for strings too.
+# The workers can not paint. They send every state they expand to the coordinator, which decodes and
+# paints it, with the parent chain of the states painted so far. With noPaint nothing is sent.
+#
+# Each worker needs a CPU of its own. The workers expand their own best states, not the best of all, so
+# together they expand more states than aStarAlgorithm. That pays off on wide searches, not on narrow dives
+# like spiral-500 of Module2, where the path goes from worker to worker one state at a time.
+
+infinity = float("inf")
+
+
+# The codec when none is given, the states themselves go through the queues
+def sameState(state):
+    return state
+
+
+def getOwner(key, numberOfWorkers):
+    return hash(key) % numberOfWorkers
+
+
+def runWorker(workerId, inboxes, results, incumbent, incumbentLock,
+              getNeighbours, h_func, arcCost, encode, decode, reportExpansions, batchSize):
+    try:
+        searchWorker(workerId, inboxes, results, incumbent, incumbentLock,
+                     getNeighbours, h_func, arcCost, encode, decode, reportExpansions, batchSize)
+    except Exception:
+        results.put(("error", workerId, traceback.format_exc()))
+
+
+def searchWorker(workerId, inboxes, results, incumbent, incumbentLock,
+                 getNeighbours, h_func, arcCost, encode, decode, reportExpansions, batchSize):
+    numberOfWorkers = len(inboxes)
+    inbox = inboxes[workerId]
+
+    open = HeapFrontier()
+    openIndex = {}
+    closedIndex = {}
+    # Parent key of every stored state, None for the initial state
+    parents = {}
+    # Kids for the other workers, as (encoded state, g, parent key)
+    outboxes = [[] for i in range(numberOfWorkers)]
+    # Expanded states for the coordinator to paint, the same way
+    expansions = []
+
+    counters = {"generated": 0, "expanded": 0, "sent": 0, "received": 0}
+    bestGoal = [None]
+    # Set when there was something to do since the coordinator was last told that this worker is idle
+    busy = [False]
+
+    def addState(state, g, parentKey):
+        key = state.key()
+        stored = openIndex.get(key)
+        if stored is None:
+            stored = closedIndex.get(key)
+        if stored is not None and stored.g <= g:
+            return
+
+        if stored is None:
+            stored = state
+            stored.parent = None
+            stored.h = h_func(stored)
+            counters["generated"] += 1
+        elif key in closedIndex:
+            del closedIndex[key]
+        stored.g = g
+        parents[key] = parentKey
+
+        # Goals are not expanded, all that matters is their f
+        if stored.isGoal():
+            closedIndex[key] = stored
+            openIndex.pop(key, None)
+            goalF = g + stored.h
+            if bestGoal[0] is None or goalF < bestGoal[0].g + bestGoal[0].h:
+                bestGoal[0] = stored
+            with incumbentLock:
+                if goalF < incumbent.value:
+                    incumbent.value = goalF
+        elif key in openIndex:
+            open.update(stored)
+        else:
+            open.push(stored)
+            openIndex[key] = stored
+
+    def send(owner):
+        inboxes[owner].put(("states", outboxes[owner]))
+        outboxes[owner] = []
+        counters["sent"] += 1
+
+    def hasWork():
+        return len(open) > 0 and open.getMinimumF() < incumbent.value
+
+    # Part of the path from key towards the initial state, as long as the states are ours
+    def getPathPart(key):
+        states = []
+        while key is not None and getOwner(key, numberOfWorkers) == workerId:
+            state = openIndex.get(key)
+            if state is None:
+                state = closedIndex[key]
+            states.append(state)
+            key = parents[key]
+        return states, key
+
+    def handle(message):
+        kind = message[0]
+        if kind == "states":
+            counters["received"] += 1
+            busy[0] = True
+            for encodedState, g, parentKey in message[1]:
+                addState(decode(encodedState), g, parentKey)
+        elif kind == "probe":
+            idle = not hasWork() and not any(outboxes)
+            results.put(("probe", message[1], workerId, idle, counters["sent"], counters["received"]))
+        elif kind == "result":
+            goal = bestGoal[0]
+            if goal is None:
+                results.put(("result", workerId, None, None, counters["generated"], counters["expanded"]))
+            else:
+                results.put(("result", workerId, goal.g + goal.h, goal.key(),
+                             counters["generated"], counters["expanded"]))
+        elif kind == "path":
+            states, nextKey = getPathPart(message[1])
+            results.put(("path", states, nextKey))
+        elif kind == "stop":
+            return False
+        return True
+
+    while True:
+        # Everything that has arrived, without waiting
+        while True:
+            try:
+                message = inbox.get_nowait()
+            except Empty:
+                break
+            if not handle(message):
+                return
+
+        # Up to batchSize expansions, then the batches go out and the inbox is read again
+        numberOfExpansions = 0
+        while numberOfExpansions < batchSize and hasWork():
+            currentTile = open.pop()
+            key = currentTile.key()
+            del openIndex[key]
+            closedIndex[key] = currentTile
+            counters["expanded"] += 1
+            numberOfExpansions += 1
+            if reportExpansions:
+                expansions.append((encode(currentTile), currentTile.g, parents[key]))
+
+            for kid in getNeighbours(currentTile):
+                kidG = currentTile.g + arcCost(currentTile, kid)
+                owner = getOwner(kid.key(), numberOfWorkers)
+                if owner == workerId:
+                    addState(kid, kidG, key)
+                else:
+                    kid.parent = None
+                    outboxes[owner].append((encode(kid), kidG, key))
+                    if len(outboxes[owner]) >= batchSize:
+                        send(owner)
+
+        for owner in range(numberOfWorkers):
+            if outboxes[owner]:
+                send(owner)
+        if expansions:
+            results.put(("expanded", expansions[:]))
+            del expansions[:]
+
+        # Nothing to do until a message comes
+        if not hasWork():
+            if busy[0]:
+                results.put(("idle", workerId))
+                busy[0] = False
+            if not handle(inbox.get()):
+                return
+
+
+# Returns the goal node, or initialState if there was no goal
+# processes is the number of workers, batchSize the most states in one message and the most expansions
+# between two reads of the inbox. encode and decode are the codec of the states sent between workers
+# Needs the fork start method of multiprocessing, so it does not run on Windows
+def hdaStarAlgorithm(getNeighbours,
+                     h_func,
+                     initialState,
+                     paint,
+                     arcCost=None,
+                     stats=None,
+                     quiet=False,
+                     processes=None,
+                     batchSize=64,
+                     encode=None,
+                     decode=None):
+
+    if arcCost is None:
+        arcCost = unitArcCost
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if encode is None:
+        encode = decode = sameState
+    if "fork" not in multiprocessing.get_all_start_methods():
+        raise RuntimeError("hdaStarAlgorithm needs the fork start method of multiprocessing, "
+                           "which this platform does not have")
+
+    context = multiprocessing.get_context("fork")
+    inboxes = [context.Queue() for i in range(processes)]
+    results = context.Queue()
+    incumbent = context.RawValue("d", infinity)
+    incumbentLock = context.Lock()
+    reportExpansions = paint is not noPaint
+
+    workers = [context.Process(target=runWorker,
+                               args=(workerId, inboxes, results, incumbent, incumbentLock,
+                                     getNeighbours, h_func, arcCost, encode, decode, reportExpansions, batchSize),
+                               daemon=True)
+               for workerId in range(processes)]
+    for worker in workers:
+        worker.start()
+
+    # The states painted so far by key, so each one gets its parent chain
+    painted = {}
+    # Set when a worker has run out of work since the last probe wave
+    idleSinceWave = False
+
+    # Waits for a message of one of the kinds, and paints the expansions and notes the idle workers
+    # that come before it
+    def getResult(kinds):
+        nonlocal idleSinceWave
+        while True:
+            result = results.get()
+            kind = result[0]
+            if kind == "error":
+                raise RuntimeError("HDA* worker " + str(result[1]) + " failed:\n" + result[2])
+            elif kind == "expanded":
+                for encodedState, g, parentKey in result[1]:
+                    state = decode(encodedState)
+                    state.g = g
+                    state.parent = painted.get(parentKey)
+                    painted[state.key()] = state
+                    paint(state)
+            elif kind == "idle":
+                idleSinceWave = True
+            if kind in kinds:
+                return result
+
+    # Replies to one message sent to every worker
+    def askAll(message, kind):
+        for inbox in inboxes:
+            inbox.put(message)
+        return [getResult((kind,)) for inbox in inboxes]
+
+    try:
+        initialState.parent = None
+        inboxes[getOwner(initialState.key(), processes)].put(("states", [(encode(initialState), 0, None)]))
+        numberOfMessagesSent = 1
+
+        # A probe wave each time a worker has gone idle, until two waves in a row see the same idle state
+        lastWave = None
+        wave = 0
+        while True:
+            if not idleSinceWave:
+                getResult(("idle",))
+            idleSinceWave = False
+
+            wave += 1
+            replies = askAll(("probe", wave), "probe")
+            idle = all(reply[3] for reply in replies)
+            sent = numberOfMessagesSent + sum(reply[4] for reply in replies)
+            received = sum(reply[5] for reply in replies)
+            thisWave = (idle, sent, received)
+            if idle and sent == received and thisWave == lastWave:
+                break
+            lastWave = thisWave
+            # Everybody is idle, the next wave confirms it
+            if idle:
+                idleSinceWave = True
+
+        replies = askAll(("result",), "result")
+        numberOfNodesGenerated = sum(reply[4] for reply in replies)
+        numberOfNodesExpanded = sum(reply[5] for reply in replies)
+        goals = [(reply[2], reply[1], reply[3]) for reply in replies if reply[2] is not None]
+
+        goalNode = None
+        if goals:
+            goalF, owner, key = min(goals, key=lambda goal: goal[0])
+            # Ask the owners for the path, one part at a time, and link it up from the goal
+            lastNode = None
+            while key is not None:
+                inboxes[getOwner(key, processes)].put(("path", key))
+                result, states, key = getResult(("path",))
+                for state in states:
+                    if lastNode is None:
+                        goalNode = state
+                    else:
+                        lastNode.parent = state
+                    lastNode = state
+            lastNode.parent = None
+
+        for inbox in inboxes:
+            inbox.put(("stop",))
+        for worker in workers:
+            worker.join()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    if goalNode is None:
+        if not quiet:
+            print("No goal found")
+        saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, None)
+        return initialState
+
+    paint(goalNode)
+    numberOfNodesInSolutionPath = getSolutionPathLength(goalNode)
+    if not quiet:
+        printSearchStats("HDA*", numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+    saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+    return goalNode
+
+
+# Runs aStarAlgorithm and HDA* with each number of processes on each map
+# Prints the time of each run, the speedup over aStarAlgorithm and if the path lengths agree
+def benchmark(mapPaths, processCounts):
+    print("map, A* seconds, " + ", ".join("HDA* %d seconds, speedup" % n for n in processCounts) + ", mismatches")
+    for mapPath in mapPaths:
+        with open(mapPath, 'r') as f:
+            board.loadBoard(f, headless=True)
+        startX, startY = Node.startNode.x, Node.startNode.y
+
+        aStarStats = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            startTime = perf_counter()
+            aStarAlgorithm(board.getSurroundingTiles, board.manhattenDistToGoalNode, Node(startX, startY), noPaint,
+                           stats=aStarStats)
+            aStarSeconds = perf_counter() - startTime
+
+        columns = ["%.3f" % aStarSeconds]
+        mismatches = 0
+        for processes in processCounts:
+            hdaStats = {}
+            startTime = perf_counter()
+            hdaStarAlgorithm(board.getSurroundingTiles, board.manhattenDistToGoalNode, Node(startX, startY), noPaint,
+                             stats=hdaStats, quiet=True, processes=processes, encode=encodeNode, decode=decodeNode)
+            seconds = perf_counter() - startTime
+            columns.append("%.3f, %.2f" % (seconds, aStarSeconds / max(seconds, 1e-9)))
+            if hdaStats["pathLength"] != aStarStats["pathLength"]:
+                mismatches += 1
+        print("%s, %s, %d" % (mapPath, ", ".join(columns), mismatches))
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Compare HDA* on several processes with aStarAlgorithm")
+    parser.add_argument("maps", nargs="+", help="map files, same format as navig1.txt")
+    parser.add_argument("--processes", default="1,2,4,8", help="comma separated numbers of worker processes")
+    arguments = parser.parse_args(arguments)
+    benchmark(arguments.maps, [int(n) for n in arguments.processes.split(",")])
+
+
+if __name__ == "__main__":
+    main()
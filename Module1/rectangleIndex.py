@@ -0,0 +1,105 @@
+from bisect import bisect_right
+
+from Module1.obstacleGrid import ObstacleGrid
+
+
+# Obstacles of the board as the rectangles of the map file, for boards too large for one bit per cell
+# Same methods as ObstacleGrid, the cost of loading and of a lookup depends on the number
+# of rectangles and not on the size of the board
+#
+# The board is cut into vertical slabs at every left and right edge of a rectangle. Inside a slab
+# every column is covered by the same rectangles, so a slab only keeps the merged y ranges they cover.
+# A lookup is a binary search for the slab and one for the y range
+class RectangleIndex:
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.rectangles = []
+
+        # Built again on the first lookup after a rectangle is added
+        self.slabStarts = None
+        self.rangeStarts = None
+        self.rangeEnds = None
+
+    def cellId(self, x, y):
+        return x * self.height + y
+
+    def isObstacle(self, x, y):
+        if self.slabStarts is None:
+            self.buildIndex()
+        slab = bisect_right(self.slabStarts, x) - 1
+        if slab < 0:
+            return False
+        rangeStarts = self.rangeStarts[slab]
+        i = bisect_right(rangeStarts, y) - 1
+        return i >= 0 and y < self.rangeEnds[slab][i]
+
+    # Same as isObstacle, but for a cell id
+    def isBlocked(self, i):
+        x, y = divmod(i, self.height)
+        return self.isObstacle(x, y)
+
+    def add(self, x, y):
+        self.addRectangle(x, y, 1, 1)
+
+    # Cells outside the board are ignored
+    def addRectangle(self, startX, startY, width, height):
+        x0 = max(startX, 0)
+        y0 = max(startY, 0)
+        x1 = min(startX + width, self.width)
+        y1 = min(startY + height, self.height)
+        if x0 < x1 and y0 < y1:
+            self.rectangles.append((x0, y0, x1 - x0, y1 - y0))
+            self.slabStarts = None
+
+    # Takes out a rectangle that was added before, returns False if there is no such rectangle
+    def removeRectangle(self, startX, startY, width, height):
+        x0 = max(startX, 0)
+        y0 = max(startY, 0)
+        x1 = min(startX + width, self.width)
+        y1 = min(startY + height, self.height)
+        if (x0, y0, x1 - x0, y1 - y0) not in self.rectangles:
+            return False
+        self.rectangles.remove((x0, y0, x1 - x0, y1 - y0))
+        self.slabStarts = None
+        return True
+
+    def buildIndex(self):
+        edges = set()
+        for x, y, width, height in self.rectangles:
+            edges.add(x)
+            edges.add(x + width)
+        slabStarts = sorted(edges)
+
+        # The y ranges that cover each slab, the last slab is right of every rectangle and stays empty
+        ranges = [[] for i in slabStarts]
+        for x, y, width, height in self.rectangles:
+            first = bisect_right(slabStarts, x) - 1
+            last = bisect_right(slabStarts, x + width - 1) - 1
+            for slab in range(first, last + 1):
+                ranges[slab].append((y, y + height))
+
+        self.rangeStarts = []
+        self.rangeEnds = []
+        for slabRanges in ranges:
+            starts = []
+            ends = []
+            for start, end in sorted(slabRanges):
+                if ends and start <= ends[-1]:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            self.rangeStarts.append(starts)
+            self.rangeEnds.append(ends)
+        self.slabStarts = slabStarts
+
+    # The obstacles as one bit per cell, like ObstacleGrid.bits
+    # Made from scratch on every call, for code that works on the whole board anyway
+    @property
+    def bits(self):
+        grid = ObstacleGrid(self.width, self.height)
+        for rectangle in self.rectangles:
+            grid.addRectangle(*rectangle)
+        return grid.bits
@@ -0,0 +1,171 @@
+from collections import OrderedDict
+
+from Module1 import board
+from Module1.node import Node
+from Module1.frontier import HeapFrontier
+from Module1.aStarProgram import getSolutionPathLength, printSearchStats, saveSearchStats, unitArcCost
+
+# One search answering many queries
+#
+# A SearchTree is a Dijkstra search from one root that only goes as far as the queries so far needed,
+# and goes on from there for the next query. Every closed node has its shortest path in its parent chain.
+# - one to many: a tree rooted at the start, one sweep settles all the goals
+# - many to one: a tree rooted at the goal, searching backwards. The board can be walked both ways,
+#   so the path from any start is the parent chain from that start to the root, read backwards
+#
+# The last maxSearchTrees trees of the current board are kept between calls, and dropped when an obstacle changes
+
+
+class SearchTree:
+
+    def __init__(self, getNeighbours, root, arcCost=None):
+        if arcCost is None:
+            arcCost = unitArcCost
+        self.getNeighbours = getNeighbours
+        self.arcCost = arcCost
+        self.root = root
+
+        root.g = 0
+        root.h = 0
+        root.parent = None
+        self.open = HeapFrontier()
+        self.open.push(root)
+        self.openIndex = {root.key(): root}
+        self.closedIndex = {}
+
+        # Counters to display at the end of each query
+        self.numberOfNodesGenerated = 1
+        self.numberOfNodesExpanded = 0
+        # The counters at the time each key was closed
+        self.countersAtClose = {}
+
+    # Expands until every key in keys is closed, or nothing is left to expand
+    def expandUntil(self, keys):
+        keysLeft = set(key for key in keys if key not in self.closedIndex)
+        while keysLeft and len(self.open) > 0:
+            currentTile = self.open.pop()
+            key = currentTile.key()
+            del self.openIndex[key]
+            self.closedIndex[key] = currentTile
+            self.numberOfNodesExpanded = self.numberOfNodesExpanded + 1
+            self.countersAtClose[key] = (self.numberOfNodesGenerated, self.numberOfNodesExpanded)
+            keysLeft.discard(key)
+
+            for kid in self.getNeighbours(currentTile):
+                kidKey = kid.key()
+                if kidKey in self.closedIndex:
+                    continue
+                kidG = currentTile.g + self.arcCost(currentTile, kid)
+                storedKid = self.openIndex.get(kidKey)
+
+                #First time node is visited
+                if storedKid is None:
+                    kid.parent = currentTile
+                    kid.g = kidG
+                    kid.h = 0
+                    self.open.push(kid)
+                    self.openIndex[kidKey] = kid
+                    self.numberOfNodesGenerated += 1
+                elif kidG < storedKid.g:
+                    storedKid.parent = currentTile
+                    storedKid.g = kidG
+                    self.open.update(storedKid)
+
+    # The closed node of key, with the shortest path from the root in its parent chain
+    # None if key can not be reached
+    def getNode(self, key):
+        self.expandUntil([key])
+        return self.closedIndex.get(key)
+
+    # Number of nodes generated and expanded when key was closed
+    # For a key that can not be reached, the counters when the search ran out of nodes
+    def getCounters(self, key):
+        self.expandUntil([key])
+        return self.countersAtClose.get(key, (self.numberOfNodesGenerated, self.numberOfNodesExpanded))
+
+
+maxSearchTrees = 8
+
+# Root -> tree, the tree used last is at the end
+searchTrees = OrderedDict()
+treeObstacles = None
+
+
+def clearSearchTrees(startX, startY, width, height):
+    searchTrees.clear()
+
+
+# The search tree of the current board rooted at x, y
+def getSearchTree(x, y):
+    global treeObstacles
+    if treeObstacles is not board.obstacles:
+        searchTrees.clear()
+        treeObstacles = board.obstacles
+        board.addObstacleListener(clearSearchTrees)
+
+    tree = searchTrees.get((x, y))
+    if tree is None:
+        tree = searchTrees[(x, y)] = SearchTree(board.getSurroundingTiles, Node(x, y))
+        if len(searchTrees) > maxSearchTrees:
+            searchTrees.popitem(last=False)
+    else:
+        searchTrees.move_to_end((x, y))
+    return tree
+
+
+# Shortest paths from Node.startNode to every (x, y) in goals, from one sweep
+# Returns a dict from goal to goal node, None for goals that can not be reached.
+# The counters of each goal are the ones of the sweep at the time the goal was reached,
+# stats gets one dict of counters per goal
+def oneToManySearch(goals, paint, stats=None):
+    tree = getSearchTree(Node.startNode.x, Node.startNode.y)
+    tree.expandUntil(goals)
+
+    goalNodes = {}
+    for goal in goals:
+        goalNodes[goal] = reportQuery(tree, goal, tree.getNode(goal), "Dijkstra to " + str(goal), paint, stats)
+    return goalNodes
+
+
+# Shortest paths from every (x, y) in starts to Node.goalX, Node.goalY, from one backward search
+# Returns a dict from start to goal node, with the path from that start in its parent chain
+def manyToOneSearch(starts, paint, stats=None):
+    tree = getSearchTree(Node.goalX, Node.goalY)
+    tree.expandUntil(starts)
+
+    goalNodes = {}
+    for start in starts:
+        goalNode = None
+        treeNode = tree.getNode(start)
+        # Copies of the tree nodes from start to the root, with the parents the other way around,
+        # so the last copy is the goal and its parent chain leads back to start
+        if treeNode is not None:
+            totalCost = treeNode.g
+            while treeNode is not None:
+                node = Node(treeNode.x, treeNode.y)
+                node.parent = goalNode
+                node.g = totalCost - treeNode.g
+                node.h = 0
+                goalNode = node
+                treeNode = treeNode.parent
+        goalNodes[start] = reportQuery(tree, start, goalNode, "Dijkstra from " + str(start), paint, stats)
+    return goalNodes
+
+
+# Prints and saves the counters of the tree at the time query was closed
+def reportQuery(tree, query, goalNode, name, paint, stats):
+    queryStats = None
+    if stats is not None:
+        queryStats = stats[query] = {}
+    numberOfNodesGenerated, numberOfNodesExpanded = tree.getCounters(query)
+
+    if goalNode is None:
+        print(name + ": no goal found")
+        saveSearchStats(queryStats, numberOfNodesGenerated, numberOfNodesExpanded, None)
+        return None
+
+    paint(goalNode)
+    numberOfNodesInSolutionPath = getSolutionPathLength(goalNode)
+    printSearchStats(name, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+    saveSearchStats(queryStats, numberOfNodesGenerated, numberOfNodesExpanded, numberOfNodesInSolutionPath)
+    return goalNode
@@ -0,0 +1,157 @@
+import argparse
+import contextlib
+import io
+from time import perf_counter
+
+import numpy as np
+
+from Module1 import board
+from Module1.node import Node
+from Module1.aStarProgram import aStarAlgorithm, getSolutionPathLength, printSearchStats, saveSearchStats, \
+    noPaint, unitArcCost
+from Module1.frontier import BucketFrontier
+
+# Weighted terrain boards, the format of Old/Eclipse/Oving3_AI/src/levels/board-2-*.txt
+# One line of symbols per row, the first line is the top row. The costs are the ones in Symbol.java:
+# '#' wall, '.' 1, 'A' start, 'B' goal, 'w' water 100, 'm' mountains 50, 'f' forests 10, 'g' grasslands 5, 'r' roads 1
+#
+# Moving into a cell costs the cost of that cell. The walls are obstacles of the board, the costs are kept in a
+# NumPy array with one byte per cell, numbered x*height + y like the board. Every cost is at least 1, so
+# Manhattan distance stays a consistent heuristic, and the f values are integers for BucketFrontier
+#
+# Usage: python -m Module1.terrain Old/Eclipse/Oving3_AI/src/levels/board-2-1.txt ...
+# Compares each board with its terrain costs and with every cost set to 1
+
+WALL = 0
+
+terrainCosts = {'#': WALL, '.': 1, 'A': 1, 'B': 1, 'w': 100, 'm': 50, 'f': 10, 'g': 5, 'r': 1}
+
+terrainColors = {'w': "blue", 'm': "grey", 'f': "dark green", 'g': "light green", 'r': "dark orange"}
+
+# Cost of every cell of the current board, 0 for walls, and the same costs as a plain list
+# arcCost looks up one cell at a time, which is faster in a list than in an array
+costs = None
+costList = None
+
+
+# Reads a terrain board into board, returns the width and height
+def loadTerrainBoard(f, headless=False):
+    global costs, costList
+    rows = [line.rstrip("\r\n") for line in f if line.strip()]
+    width = max(len(row) for row in rows)
+    height = len(rows)
+    board.setDimensions(width, height, headless)
+    board.createBoard()
+
+    symbols = np.full((width, height), ord('#'), dtype=np.uint8)
+    for row, line in enumerate(rows):
+        symbols[:len(line), height - 1 - row] = np.frombuffer(line.encode("ascii"), dtype=np.uint8)
+
+    lookup = np.zeros(256, dtype=np.uint8)
+    for symbol, cost in terrainCosts.items():
+        lookup[ord(symbol)] = cost
+    unknown = ~np.isin(symbols, [ord(symbol) for symbol in terrainCosts])
+    if unknown.any():
+        x, y = np.argwhere(unknown)[0]
+        raise ValueError("Unknown terrain symbol " + repr(chr(symbols[x, y])))
+    costs = lookup[symbols].ravel()
+    costList = costs.tolist()
+
+    # Walls as one obstacle per run in a column
+    for x in range(width):
+        column = costs[x * height:(x + 1) * height] == WALL
+        y = 0
+        while y < height:
+            if not column[y]:
+                y += 1
+                continue
+            runStart = y
+            while y < height and column[y]:
+                y += 1
+            board.createObstacle(x, runStart, 1, y - runStart)
+
+    for symbol, color in terrainColors.items():
+        for x, y in np.argwhere(symbols == ord(symbol)):
+            board.drawBox(int(x), int(y), color)
+
+    start = np.argwhere(symbols == ord('A'))
+    goal = np.argwhere(symbols == ord('B'))
+    if len(start) != 1 or len(goal) != 1:
+        raise ValueError("A terrain board needs one A and one B")
+    board.createStart(int(start[0][0]), int(start[0][1]))
+    board.createGoal(int(goal[0][0]), int(goal[0][1]))
+    return width, height
+
+
+# arcCost for aStarAlgorithm, the cost of the cell moved into
+def terrainArcCost(node1, node2):
+    return costList[node2.x * board.height + node2.y]
+
+
+# Costs of many cells at once, for arrays of cell ids
+def getArcCosts(cells):
+    return costs[cells]
+
+
+# Sum of the arc costs along the parent chain of node
+def getPathCost(node):
+    cells = []
+    while node.parent is not None:
+        cells.append(node.x * board.height + node.y)
+        node = node.parent
+    return int(getArcCosts(np.array(cells, dtype=np.int64)).sum(dtype=np.int64))
+
+
+# A* from Node.startNode on the current terrain board, with a bucket queue
+def terrainAStar(paint, stats=None, arcCost=None):
+    if arcCost is None:
+        arcCost = terrainArcCost
+    searchStats = {}
+    goalNode = aStarAlgorithm(board.getSurroundingTiles, board.manhattenDistToGoalNode, Node.startNode, paint,
+                              arcCost=arcCost, stats=searchStats, quiet=True, frontier=BucketFrontier(),
+                              consistent=True)
+
+    if searchStats["pathLength"] is None:
+        print("No goal found")
+        saveSearchStats(stats, searchStats["generated"], searchStats["expanded"], None)
+        return None
+
+    numberOfNodesInSolutionPath = getSolutionPathLength(goalNode)
+    printSearchStats("Terrain A*", searchStats["generated"], searchStats["expanded"], numberOfNodesInSolutionPath)
+    print("Path cost: ", goalNode.g)
+    saveSearchStats(stats, searchStats["generated"], searchStats["expanded"], numberOfNodesInSolutionPath)
+    if stats is not None:
+        stats["cost"] = goalNode.g
+    return goalNode
+
+
+# Runs every board with its terrain costs and with unit costs, and prints the expansions per second of both
+def benchmark(paths, repeats=5):
+    print("board, weighted cost, weighted expanded, weighted nodes/s, uniform cost, uniform expanded, uniform nodes/s")
+    for path in paths:
+        columns = []
+        for arcCost in (terrainArcCost, unitArcCost):
+            seconds = 0
+            for repeat in range(repeats):
+                with open(path, 'r') as f:
+                    loadTerrainBoard(f, headless=True)
+                stats = {}
+                with contextlib.redirect_stdout(io.StringIO()):
+                    startTime = perf_counter()
+                    terrainAStar(noPaint, stats, arcCost)
+                    seconds += perf_counter() - startTime
+            columns.append("%s, %d, %.0f" % (stats.get("cost"), stats["expanded"],
+                                             stats["expanded"] * repeats / max(seconds, 1e-9)))
+        print("%s, %s" % (path, ", ".join(columns)))
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Compare A* on terrain boards with and without terrain costs")
+    parser.add_argument("boards", nargs="+", help="terrain boards, like board-2-1.txt")
+    parser.add_argument("--repeats", type=int, default=5)
+    arguments = parser.parse_args(arguments)
+    benchmark(arguments.boards, arguments.repeats)
+
+
+if __name__ == "__main__":
+    main()
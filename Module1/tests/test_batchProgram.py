@@ -0,0 +1,51 @@
+import csv
+import io
+import os
+import shutil
+
+import pytest
+
+from Module1.batchProgram import possibleModes, resultFields, runMap, runBatch
+
+mapDirectory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+mapNames = ["navig1.txt", "navig2.txt", "navig3.txt", "0.txt", "1.txt", "2.txt", "3.txt", "4.txt", "5.txt"]
+
+# Modes that are not meant to find the shortest path
+inexactModes = ["dfs", "hpa"]
+
+
+# Copies of the bundled maps, alt and ch write their tables next to the map
+@pytest.fixture(scope="module")
+def mapPaths(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("maps")
+    paths = []
+    for name in mapNames:
+        path = str(directory / name)
+        shutil.copy(os.path.join(mapDirectory, name), path)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("mapIndex", range(len(mapNames)), ids=mapNames)
+def test_every_mode_finds_the_same_path_length(mapPaths, mapIndex):
+    path = mapPaths[mapIndex]
+    rows = {mode: runMap((path, mode)) for mode in possibleModes}
+    expected = rows["astar"]
+
+    for mode, row in rows.items():
+        assert row["found"] == expected["found"], mode
+        if mode in inexactModes:
+            if expected["found"]:
+                assert row["pathLength"] >= expected["pathLength"], mode
+        else:
+            assert row["pathLength"] == expected["pathLength"], mode
+
+
+def test_batch_writes_one_row_per_run(mapPaths):
+    output = io.StringIO()
+    runBatch(mapPaths[:2], ["astar", "bfs"], output, processes=1)
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert len(rows) == 4
+    assert list(rows[0].keys()) == resultFields
+    assert [(row["map"], row["mode"]) for row in rows] == \
+        [(path, mode) for path in mapPaths[:2] for mode in ["astar", "bfs"]]
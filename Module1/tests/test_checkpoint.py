@@ -0,0 +1,87 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from Module1 import board
+from Module1.node import Node
+from Module1.aStarProgram import aStarAlgorithm, noPaint
+from Module1.frontier import BucketFrontier
+from Module1.checkpoint import SearchCheckpoint
+
+
+class Killed(Exception):
+    pass
+
+
+def setupRandomBoard(rng):
+    width, height = rng.randint(5, 25), rng.randint(5, 25)
+    board.setDimensions(width, height, headless=True)
+    board.createBoard()
+    for i in range(rng.randint(0, 30)):
+        board.createObstacle(rng.randrange(width), rng.randrange(height), rng.randint(1, 5), rng.randint(1, 5))
+    cells = [(x, y) for x in range(width) for y in range(height) if board.isWalkable(x, y)]
+    start, goal = rng.sample(cells, 2)
+    board.createStart(*start)
+    board.createGoal(*goal)
+
+
+def runSearch(paint, stats, checkpoint=None, consistent=False, weight=1):
+    frontier = BucketFrontier() if consistent else None
+
+    def heuristic(node):
+        return weight * board.manhattenDistToGoalNode(node)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return aStarAlgorithm(board.getSurroundingTiles, heuristic, Node(Node.startNode.x, Node.startNode.y),
+                              paint, stats=stats, frontier=frontier, consistent=consistent, checkpoint=checkpoint)
+
+
+# A search killed after a random number of expansions and resumed, maybe more than once,
+# ends with the same counters as one that was never stopped
+@pytest.mark.parametrize("consistent, weight", [(True, 1), (False, 1), (False, 3)])
+def test_resume_gives_the_same_search(tmp_path, consistent, weight):
+    rng = random.Random(weight)
+    for run in range(20):
+        setupRandomBoard(rng)
+        expected = {}
+        runSearch(noPaint, expected, consistent=consistent, weight=weight)
+
+        path = str(tmp_path / ("search%d.ck" % run))
+        numberOfPaints = [0]
+        limit = [rng.randint(1, expected["expanded"])]
+
+        def paint(node):
+            numberOfPaints[0] += 1
+            if limit[0] is not None and numberOfPaints[0] >= limit[0]:
+                raise Killed()
+
+        stats = {}
+        for attempt in range(3):
+            try:
+                runSearch(paint, stats, SearchCheckpoint(path, everyExpansions=rng.choice([1, 5])), consistent, weight)
+                break
+            except Killed:
+                limit[0] = numberOfPaints[0] + rng.randint(1, 20) if attempt == 0 else None
+        assert stats == expected
+
+        # A finished search gives back its goal without searching again
+        stats = {}
+        goalNode = runSearch(noPaint, stats, SearchCheckpoint(path), consistent, weight)
+        assert stats == expected
+        if expected["pathLength"] is not None:
+            assert goalNode.isGoal()
+
+
+def test_file_is_closed_when_a_callback_raises(tmp_path):
+    setupRandomBoard(random.Random(0))
+    checkpoint = SearchCheckpoint(str(tmp_path / "search.ck"), everyExpansions=1)
+
+    def paint(node):
+        raise Killed()
+
+    with pytest.raises(Killed):
+        runSearch(paint, {}, checkpoint)
+    assert checkpoint.file is None
+
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from Module1.node import Node
+from Module1.frontier import HeapFrontier, BucketFrontier
+
+
+def makeNode(x, g, h):
+    node = Node(x, 0)
+    node.g = g
+    node.h = h
+    return node
+
+
+# Random pushes, updates and pops, both open lists must give the nodes in the same order
+def test_bucket_order_matches_heap():
+    rng = random.Random(0)
+    for run in range(50):
+        heap = HeapFrontier()
+        buckets = BucketFrontier()
+        nodes = []
+        heapOrder = []
+        bucketOrder = []
+        for step in range(200):
+            action = rng.random()
+            if action < 0.5 or not nodes:
+                node = makeNode(step, rng.randint(0, 20), rng.randint(0, 10))
+                nodes.append(node)
+                heap.push(node)
+                buckets.push(node)
+            elif action < 0.7:
+                node = rng.choice(nodes)
+                if node.g > 0:
+                    node.g -= 1
+                    heap.update(node)
+                    buckets.update(node)
+            elif len(heap) > 0:
+                assert heap.getMinimumF() == buckets.getMinimumF()
+                heapNode = heap.pop()
+                bucketNode = buckets.pop()
+                nodes.remove(heapNode)
+                heapOrder.append(heapNode.x)
+                bucketOrder.append(bucketNode.x)
+        while len(heap) > 0:
+            heapOrder.append(heap.pop().x)
+            bucketOrder.append(buckets.pop().x)
+        assert heapOrder == bucketOrder
+        assert len(buckets) == 0
+
+
+def test_bucket_pops_lowest_f_then_lowest_h():
+    buckets = BucketFrontier()
+    for x, g, h in [(0, 3, 2), (1, 1, 4), (2, 4, 0), (3, 0, 6), (4, 2, 0)]:
+        buckets.push(makeNode(x, g, h))
+    assert [buckets.pop().x for i in range(5)] == [4, 2, 0, 1, 3]
+    with pytest.raises(IndexError):
+        buckets.pop()
+
+
+def test_bucket_accepts_whole_floats():
+    buckets = BucketFrontier()
+    buckets.push(makeNode(0, 2.0, 1.0))
+    buckets.push(makeNode(1, 0, 2))
+    assert [buckets.pop().x for i in range(2)] == [1, 0]
+
+
+@pytest.mark.parametrize("g, h", [(0, 0.5), (0.5, 1), (0.25, 0.25), (0, float("inf")), (float("nan"), 0)])
+def test_bucket_rejects_fractional_keys(g, h):
+    buckets = BucketFrontier()
+    buckets.push(makeNode(0, 0, 1))
+    with pytest.raises(ValueError):
+        buckets.push(makeNode(1, g, h))
+    # The rejected node is not in the open list
+    assert len(buckets) == 1
+    assert buckets.pop().x == 0
@@ -0,0 +1,59 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+from Module1 import board
+from Module1.node import Node
+from Module1.aStarProgram import aStarAlgorithm, noPaint
+from Module1.checkpoint import encodeNode, decodeNode
+from Module1.parallelProgram import hdaStarAlgorithm
+
+mapDirectory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+mapNames = ["navig1.txt", "navig2.txt", "navig3.txt", "0.txt", "3.txt", "5.txt"]
+
+
+def loadMap(name):
+    with open(os.path.join(mapDirectory, name), 'r') as f:
+        board.loadBoard(f, headless=True)
+
+
+@pytest.mark.parametrize("name", mapNames)
+@pytest.mark.parametrize("processes", [1, 3])
+def test_same_path_length_as_astar(name, processes):
+    loadMap(name)
+    startX, startY = Node.startNode.x, Node.startNode.y
+    expected = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        aStarAlgorithm(board.getSurroundingTiles, board.manhattenDistToGoalNode, Node(startX, startY), noPaint,
+                       stats=expected)
+
+    stats = {}
+    goalNode = hdaStarAlgorithm(board.getSurroundingTiles, board.manhattenDistToGoalNode, Node(startX, startY),
+                                noPaint, stats=stats, quiet=True, processes=processes, batchSize=8,
+                                encode=encodeNode, decode=decodeNode)
+    assert stats["pathLength"] == expected["pathLength"]
+
+    # The path is a walk on the board from the start to the goal
+    if stats["pathLength"] is not None:
+        assert goalNode.isGoal()
+        node = goalNode
+        while node.parent is not None:
+            assert abs(node.x - node.parent.x) + abs(node.y - node.parent.y) == 1
+            assert board.isWalkable(node.x, node.y)
+            node = node.parent
+        assert node.key() == (startX, startY)
+
+
+# Every expanded state is painted by the coordinator, and the goal once more at the end
+@pytest.mark.parametrize("encode, decode", [(None, None), (encodeNode, decodeNode)])
+def test_every_expansion_is_painted(encode, decode):
+    loadMap("navig2.txt")
+    painted = []
+    stats = {}
+    hdaStarAlgorithm(board.getSurroundingTiles, board.manhattenDistToGoalNode,
+                     Node(Node.startNode.x, Node.startNode.y), painted.append, stats=stats, quiet=True,
+                     processes=2, encode=encode, decode=decode)
+    assert len(painted) == stats["expanded"] + 1
+    assert painted[-1].isGoal()
@@ -0,0 +1,96 @@
+import contextlib
+import io
+import random
+
+from Module1 import board
+from Module1 import searchTree
+from Module1.aStarProgram import noPaint
+from Module1.searchTree import oneToManySearch, manyToOneSearch, getSearchTree
+from Module1.wavefront import getBoardDistanceMap, UNREACHABLE
+
+
+def setupBoard(width, height, obstacles, start, goal):
+    board.setDimensions(width, height, headless=True)
+    board.createBoard()
+    for obstacle in obstacles:
+        board.createObstacle(*obstacle)
+    board.createStart(*start)
+    board.createGoal(*goal)
+
+
+def runQuiet(function, *arguments, **keywords):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*arguments, **keywords)
+
+
+# Number of nodes from the root to node, both included
+def getPathLength(node):
+    length = 0
+    while node is not None:
+        length += 1
+        node = node.parent
+    return length
+
+
+def test_each_goal_gets_its_own_counters():
+    setupBoard(20, 20, [], (0, 0), (19, 19))
+    stats = {}
+    runQuiet(oneToManySearch, [(1, 0), (19, 19)], noPaint, stats)
+
+    near = stats[(1, 0)]
+    far = stats[(19, 19)]
+    assert near["pathLength"] == 2
+    assert far["pathLength"] == 39
+    assert near["expanded"] < 10
+    assert far["expanded"] == 400
+    assert near["generated"] < far["generated"]
+
+
+def test_paths_are_shortest():
+    rng = random.Random(0)
+    for run in range(30):
+        width, height = rng.randint(3, 15), rng.randint(3, 15)
+        obstacles = [(rng.randrange(width), rng.randrange(height), rng.randint(1, 4), rng.randint(1, 4))
+                     for i in range(rng.randint(0, 6))]
+        setupBoard(width, height, obstacles, (0, 0), (0, 0))
+        cells = [(x, y) for x in range(width) for y in range(height) if board.isWalkable(x, y)]
+        if not cells:
+            continue
+        source = rng.choice(cells)
+        others = rng.sample(cells, min(5, len(cells)))
+        distances = getBoardDistanceMap(*source)
+
+        board.createStart(*source)
+        oneToMany = runQuiet(oneToManySearch, others, noPaint)
+        board.createStart(*others[0])
+        board.createGoal(*source)
+        manyToOne = runQuiet(manyToOneSearch, others, noPaint)
+
+        for other in others:
+            distance = distances[other[0] * height + other[1]]
+            if distance == UNREACHABLE:
+                assert oneToMany[other] is None
+                assert manyToOne[other] is None
+                continue
+            assert getPathLength(oneToMany[other]) == distance + 1
+            assert getPathLength(manyToOne[other]) == distance + 1
+            assert manyToOne[other].key() == source
+            assert oneToMany[other].key() == other
+
+
+def test_trees_are_limited_and_dropped_on_changes():
+    setupBoard(10, 10, [], (0, 0), (9, 9))
+    for x in range(searchTree.maxSearchTrees + 2):
+        getSearchTree(x, 0)
+    assert len(searchTree.searchTrees) == searchTree.maxSearchTrees
+    assert (0, 0) not in searchTree.searchTrees
+    assert (searchTree.maxSearchTrees + 1, 0) in searchTree.searchTrees
+
+    # The tree used last is the one kept
+    getSearchTree(2, 0)
+    getSearchTree(0, 0)
+    assert (2, 0) in searchTree.searchTrees
+    assert (3, 0) not in searchTree.searchTrees
+
+    board.createObstacle(5, 5, 1, 1)
+    assert len(searchTree.searchTrees) == 0
@@ -0,0 +1,223 @@
+from bisect import bisect_left
+
+import numpy as np
+
+from Module1 import board
+from Module1.node import Node
+from Module1.aStarProgram import aStarAlgorithm, printSearchStats, saveSearchStats
+from Module1.wavefront import getNodePath
+
+# Shortest paths on the board through the corners of the obstacle rectangles
+#
+# A shortest 4-connected path only has to turn around an obstacle at one of its corners, so it can
+# be cut into pieces that each go from a corner to a corner without ever stepping back in x or y.
+# The nodes of the graph are the free cells diagonally outside the corners of every rectangle,
+# plus start and goal. Two nodes are linked if such a monotone (staircase) path runs between them,
+# and the cost of the link is their Manhattan distance.
+# The work per query depends on the number of rectangles, not on the size of the board
+
+
+def manhattenDistance(node1, node2):
+    return abs(node1.x - node2.x) + abs(node1.y - node2.y)
+
+
+class VisibilityGraph:
+
+    def __init__(self, width, height, obstacles):
+        self.width = width
+        self.height = height
+        self.obstacles = obstacles
+        self.corners = []
+        # Corner -> the corners it is linked to
+        self.cornerLinks = {}
+        self.findCorners()
+
+    def findCorners(self):
+        corners = set()
+        for x, y, width, height in self.obstacles.rectangles:
+            for cornerX in (x - 1, x + width):
+                for cornerY in (y - 1, y + height):
+                    if 0 <= cornerX < self.width and 0 <= cornerY < self.height \
+                            and not self.obstacles.isObstacle(cornerX, cornerY):
+                        corners.add((cornerX, cornerY))
+        self.corners = sorted(corners)
+        self.cornerLinks = {}
+
+    # Obstacle listener, the corners and links have to be found again
+    def updateRegion(self, startX, startY, width, height):
+        self.findCorners()
+
+    # The blocks of a monotone path from source to target, or None if there is none
+    #
+    # Inside the box spanned by source and target, the board is cut at every edge of a rectangle.
+    # Each block is then either all free or all obstacle, and a staircase path exists if the block
+    # of target can be reached from the block of source moving only towards target.
+    # Coordinates are mirrored so that target is up and to the right of source
+    def findMonotoneBlocks(self, source, target):
+        directionX = 1 if target[0] >= source[0] else -1
+        directionY = 1 if target[1] >= source[1] else -1
+        startX, startY = source[0] * directionX, source[1] * directionY
+        endX, endY = target[0] * directionX + 1, target[1] * directionY + 1
+
+        rectangles = []
+        for x, y, width, height in self.obstacles.rectangles:
+            if directionX == 1:
+                x0, x1 = x, x + width
+            else:
+                x0, x1 = 1 - x - width, 1 - x
+            if directionY == 1:
+                y0, y1 = y, y + height
+            else:
+                y0, y1 = 1 - y - height, 1 - y
+            x0, y0, x1, y1 = max(x0, startX), max(y0, startY), min(x1, endX), min(y1, endY)
+            if x0 < x1 and y0 < y1:
+                rectangles.append((x0, y0, x1, y1))
+
+        xs = sorted({startX, endX}.union(*[(x0, x1) for x0, y0, x1, y1 in rectangles]))
+        ys = sorted({startY, endY}.union(*[(y0, y1) for x0, y0, x1, y1 in rectangles]))
+        columns = len(xs) - 1
+        rows = len(ys) - 1
+
+        blocked = np.zeros((columns, rows), dtype=bool)
+        for x0, y0, x1, y1 in rectangles:
+            blocked[bisect_left(xs, x0):bisect_left(xs, x1), bisect_left(ys, y0):bisect_left(ys, y1)] = True
+
+        # Column by column: a free block is reached from the block to its left, or from a block
+        # below it in the same run of free blocks that is reached from its left
+        reached = np.zeros((columns, rows), dtype=bool)
+        rowNumbers = np.arange(rows)
+        fromLeft = np.zeros(rows, dtype=bool)
+        fromLeft[0] = True
+        for i in range(columns):
+            free = ~blocked[i]
+            entered = np.cumsum(fromLeft & free)
+            # The last blocked row below each row, -1 if there is none
+            runStart = np.maximum.accumulate(np.where(free, -1, rowNumbers))
+            enteredBefore = np.where(runStart >= 0, entered[np.maximum(runStart, 0)], 0)
+            reached[i] = free & (entered > enteredBefore)
+            fromLeft = reached[i]
+
+        if not reached[columns - 1, rows - 1]:
+            return None
+
+        blocks = []
+        i, j = columns - 1, rows - 1
+        while True:
+            blocks.append((i, j))
+            if i > 0 and reached[i - 1, j]:
+                i -= 1
+            elif j > 0:
+                j -= 1
+            else:
+                break
+        blocks.reverse()
+        return blocks, xs, ys, directionX, directionY
+
+    # True if no rectangle covers a cell of the straight line from x0, y0 to x1, y1
+    def isLineFree(self, x0, y0, x1, y1):
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        for x, y, width, height in self.obstacles.rectangles:
+            if x <= x1 and x + width > x0 and y <= y1 and y + height > y0:
+                return False
+        return True
+
+    def isLinked(self, source, target):
+        # Most links in open areas are one of the two L shaped paths, which are cheap to check
+        for cornerX, cornerY in ((target[0], source[1]), (source[0], target[1])):
+            if self.isLineFree(source[0], source[1], cornerX, cornerY) \
+                    and self.isLineFree(cornerX, cornerY, target[0], target[1]):
+                return True
+        return self.findMonotoneBlocks(source, target) is not None
+
+    # The cells of a monotone path from source to target, source first
+    # Goes straight through each block, to the edge it shares with the next one
+    def getMonotonePath(self, source, target):
+        blocks, xs, ys, directionX, directionY = self.findMonotoneBlocks(source, target)
+        x, y = source[0] * directionX, source[1] * directionY
+        endX, endY = target[0] * directionX, target[1] * directionY
+
+        path = [(x, y)]
+        for block, nextBlock in zip(blocks, blocks[1:]):
+            if nextBlock[0] > block[0]:
+                while x < xs[nextBlock[0]]:
+                    x += 1
+                    path.append((x, y))
+            else:
+                while y < ys[nextBlock[1]]:
+                    y += 1
+                    path.append((x, y))
+        while x < endX:
+            x += 1
+            path.append((x, y))
+        while y < endY:
+            y += 1
+            path.append((x, y))
+
+        return [(x * directionX, y * directionY) for x, y in path]
+
+    def getCornerLinks(self, corner):
+        links = self.cornerLinks.get(corner)
+        if links is None:
+            links = [other for other in self.corners if other != corner and self.isLinked(corner, other)]
+            self.cornerLinks[corner] = links
+        return links
+
+    # Visibility graph A* from startX, startY to Node.goalX, Node.goalY
+    # Returns the goal node with every cell of the path in its parent chain, or None
+    def search(self, startX, startY, paint, stats=None):
+        start = (startX, startY)
+        goal = (Node.goalX, Node.goalY)
+        cornerSet = set(self.corners)
+
+        def getNeighbours(node):
+            cell = (node.x, node.y)
+            if cell in cornerSet:
+                links = list(self.getCornerLinks(cell))
+            else:
+                links = [other for other in self.corners if other != cell and self.isLinked(cell, other)]
+            if goal != cell and goal not in cornerSet and self.isLinked(cell, goal):
+                links.append(goal)
+            return [Node(x, y) for x, y in links]
+
+        searchStats = {}
+        goalNode = aStarAlgorithm(getNeighbours, board.manhattenDistToGoalNode, Node(startX, startY), paint,
+                                  arcCost=manhattenDistance, stats=searchStats, quiet=True)
+
+        if searchStats["pathLength"] is None:
+            print("No goal found")
+            saveSearchStats(stats, searchStats["generated"], searchStats["expanded"], None)
+            return None
+
+        graphPath = []
+        node = goalNode
+        while node is not None:
+            graphPath.append((node.x, node.y))
+            node = node.parent
+        graphPath.reverse()
+
+        path = [start]
+        for source, target in zip(graphPath, graphPath[1:]):
+            path.extend(self.getMonotonePath(source, target)[1:])
+
+        goalNode = getNodePath([x * self.height + y for x, y in path], self.height)
+        printSearchStats("Visibility graph A*", searchStats["generated"], searchStats["expanded"], len(path))
+        saveSearchStats(stats, searchStats["generated"], searchStats["expanded"], len(path))
+        return goalNode
+
+
+visibilityGraph = None
+
+
+# The visibility graph of the current board, kept up to date with createObstacle
+def getVisibilityGraph():
+    global visibilityGraph
+    if visibilityGraph is None or visibilityGraph.obstacles is not board.obstacles:
+        visibilityGraph = VisibilityGraph(board.width, board.height, board.obstacles)
+        board.addObstacleListener(visibilityGraph.updateRegion)
+    return visibilityGraph
+
+
+# Visibility graph A* from Node.startNode to Node.goalX, Node.goalY
+def visibilityGraphAStar(paint, stats=None):
+    return getVisibilityGraph().search(Node.startNode.x, Node.startNode.y, paint, stats)
@@ -0,0 +1,122 @@
+import numpy as np
+
+from Module1 import board
+from Module1.node import Node
+from Module1.aStarProgram import printSearchStats, saveSearchStats
+
+# Breadth first search on the board as a wavefront, one NumPy pass per distance
+# The frontier is an array of cell ids (x*height + y), and all of it is expanded at once
+# Every arc costs 1, so the distance map is the same as the g values of a breadth first search
+
+UNREACHABLE = -1
+
+
+# One entry per cell, True where the board has no obstacle
+def getWalkableCells(width, height, obstacles):
+    bits = np.frombuffer(obstacles.bits, dtype=np.uint8)
+    return np.unpackbits(bits, count=width * height, bitorder="little") == 0
+
+
+# Distances from source to every cell, UNREACHABLE for obstacles and closed off cells
+# With a goal the wave stops as soon as it reaches it, and cells further away stay UNREACHABLE
+# Returns the distances and the number of cells expanded
+def getDistanceMap(walkable, width, height, source, goal=None):
+    distances = np.full(width * height, UNREACHABLE, dtype=np.int32)
+    unseen = walkable.copy()
+
+    distances[source] = 0
+    unseen[source] = False
+    frontier = np.array([source], dtype=np.int64)
+    distance = 0
+    numberOfCellsExpanded = 0
+
+    while frontier.size > 0 and (goal is None or distances[goal] == UNREACHABLE):
+        numberOfCellsExpanded += frontier.size
+        x = frontier // height
+        y = frontier - x * height
+
+        kids = np.concatenate((frontier[x > 0] - height,
+                               frontier[x < width - 1] + height,
+                               frontier[y > 0] - 1,
+                               frontier[y < height - 1] + 1))
+        kids = np.unique(kids[unseen[kids]])
+
+        distance += 1
+        distances[kids] = distance
+        unseen[kids] = False
+        frontier = kids
+
+    return distances, numberOfCellsExpanded
+
+
+# A shortest path from the source of the distance map to goal, as a list of cell ids
+# Walks from goal to ever lower distances, returns None if goal was not reached
+def extractPath(distances, width, height, goal):
+    if distances[goal] == UNREACHABLE:
+        return None
+
+    path = [goal]
+    cell = goal
+    distance = distances[goal]
+    while distance > 0:
+        x, y = divmod(cell, height)
+        distance -= 1
+        if x > 0 and distances[cell - height] == distance:
+            cell = cell - height
+        elif x < width - 1 and distances[cell + height] == distance:
+            cell = cell + height
+        elif y > 0 and distances[cell - 1] == distance:
+            cell = cell - 1
+        else:
+            cell = cell + 1
+        path.append(cell)
+
+    path.reverse()
+    return path
+
+
+# Node chain for a list of cell ids, returns the last node
+def getNodePath(path, height):
+    node = Node.startNode
+    node.g = 0
+    node.h = 0
+    node.parent = None
+    for cell in path[1:]:
+        kid = Node(*divmod(cell, height))
+        kid.parent = node
+        kid.g = node.g + 1
+        kid.h = 0
+        node = kid
+    return node
+
+
+# Distance map of the current board from x, y
+def getBoardDistanceMap(x, y):
+    walkable = getWalkableCells(board.width, board.height, board.obstacles)
+    distances, numberOfCellsExpanded = getDistanceMap(walkable, board.width, board.height, x * board.height + y)
+    return distances
+
+
+# Breadth first search from Node.startNode to Node.goalX, Node.goalY
+# Only the solution is painted, the cells of the wave are never turned into nodes
+def wavefrontBFS(paint, stats=None):
+    width = board.width
+    height = board.height
+    source = Node.startNode.x * height + Node.startNode.y
+    goal = Node.goalX * height + Node.goalY
+
+    walkable = getWalkableCells(width, height, board.obstacles)
+    distances, numberOfNodesExpanded = getDistanceMap(walkable, width, height, source, goal)
+    numberOfNodesGenerated = int(np.count_nonzero(distances != UNREACHABLE))
+
+    path = extractPath(distances, width, height, goal)
+    if path is None:
+        print("No goal found")
+        saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, None)
+        return None
+
+    goalNode = getNodePath(path, height)
+    paint(goalNode)
+    printSearchStats("Wavefront BFS", numberOfNodesGenerated, numberOfNodesExpanded, len(path))
+    saveSearchStats(stats, numberOfNodesGenerated, numberOfNodesExpanded, len(path))
+    return goalNode
@@ -1,5 +1,6 @@
 from Module1.aStarProgram import aStarAlgorithm
 from Module2.state import State
+from Module2.propagationQueue import PropagationQueue
 
 
 def aStarGAC(moduleNr,
@@ -10,7 +11,9 @@ def aStarGAC(moduleNr,
              GAC_Domain_Filter = None,
              GAC_Revise = None,
              GAC_Rerun = None,
-             GAC_Generate_Successors=None):
+             GAC_Generate_Successors=None,
+             search=None,
+             checkpoint=None):
 
     # If custom functions are not defined, go default
     if GAC_Revise is None:
@@ -23,6 +26,9 @@ def aStarGAC(moduleNr,
         GAC_Rerun = rerun
     if GAC_Generate_Successors is None:
         GAC_Generate_Successors = generateSuccesorStates
+    # Any engine with the aStarAlgorithm callbacks, e.g. idaStarAlgorithm or smaStarAlgorithm from Module1
+    if search is None:
+        search = aStarAlgorithm
 
     # if constrains are not supplied: get constraint input
     if constraints is None:
@@ -59,7 +65,14 @@ def aStarGAC(moduleNr,
         print("No solution found. Aborting")
     else:
         print("Done with init, but no solution yet. Running A*")
-        currentState = aStarAlgorithm(AStar_generate_successors, aStarGetH, currentState, paintProgress)
+        if checkpoint is None:
+            currentState = search(AStar_generate_successors, aStarGetH, currentState, paintProgress)
+        else:
+            # checkpoint is a SearchCheckpoint from Module1.checkpoint, for search engines that take one,
+            # like aStarAlgorithm. The states are written as their assumed values, see getStateCodec
+            checkpoint.setCodec(*getStateCodec(currentState, moduleNr, constraints, GAC_Domain_Filter, GAC_Revise))
+            currentState = search(AStar_generate_successors, aStarGetH, currentState, paintProgress,
+                                  checkpoint=checkpoint)
 
     print("Total number of variables that are not assigned: ", currentState.getNumberOfVariablesNotAssigned(), "/", len(currentState.vertices))
     print("Total number of unsatisfied constraints in the solution: ", getNumberOfUnsatisfiedConstraints(currentState.vertices, constraints,GAC_Revise))
@@ -88,11 +101,33 @@ def generateSuccesorStates(oldState,moduleNr):
 
     return newStates
 
+# Encode and decode functions for checkpoints, a state is written as (index, value) for every vertex that
+# has one value left. Decoding gives those values to a copy of rootState and filters again, which gives back
+# the same domains, the filtering ends in the same place whatever order the values were assumed in
+def getStateCodec(rootState, moduleNr, constraints, GAC_Domain_Filter, GAC_Revise):
+    def encode(state):
+        return tuple((vertex.index, vertex.domain[0]) for vertex in state.vertices if vertex.isAssumed())
+
+    def decode(assumedValues):
+        state = State(rootState.vertices, moduleNr)
+        queue = PropagationQueue(len(state.vertices))
+        for index, value in assumedValues:
+            vertex = state.vertices[index]
+            if len(vertex.domain) > 1:
+                vertex.domain = [value]
+                state.lastModifiedVertex = vertex
+                for connectedVertex in constraints[index]:
+                    queue.append(state.vertices[connectedVertex])
+        GAC_Domain_Filter(queue, state.vertices, constraints, GAC_Revise)
+        return state
+
+    return encode, decode
+
 def rerun(currentState, constraints,GAC_Revise):
     #Rerun
-    queue = []
+    queue = PropagationQueue(len(currentState.vertices))
     for connectedVertex in constraints[currentState.lastModifiedVertex.index]:
-        if connectedVertex not in queue and not currentState.vertices[connectedVertex].isAssumed():
+        if not currentState.vertices[connectedVertex].isAssumed():
             queue.append(currentState.vertices[connectedVertex])
 
     domainFiltering(queue,currentState.vertices, constraints,GAC_Revise)
@@ -130,11 +165,10 @@ def revise(constraints, vertex1,vertex2):
 
 #Initialize
 def mGACInit(vertices, constraints):
-    queue = []
+    queue = PropagationQueue(len(vertices))
     for vertex in constraints:
         for connectedVertex in vertex:
-            if vertices[connectedVertex] not in queue:
-                queue.append(vertices[connectedVertex])
+            queue.append(vertices[connectedVertex])
     return queue
 
 # Called after the A*GAC is finished
@@ -142,8 +176,7 @@ def getNumberOfUnsatisfiedConstraints(stateVertices, constraints, GAC_Revise):
     queue = mGACInit(stateVertices, constraints)
     counter = 0
     while len(queue) >= 1:
-        todoReviseVertex = queue.pop(0)
-        #queue.remove(todoReviseVertex)
+        todoReviseVertex = queue.popleft()
         for const in constraints[todoReviseVertex.index]:
             neighbour = stateVertices[const]
             change = GAC_Revise(constraints, todoReviseVertex,neighbour)
@@ -155,17 +188,18 @@ def getNumberOfUnsatisfiedConstraints(stateVertices, constraints, GAC_Revise):
 
 
 #The Domain-Filtering Loop
+# queue is a PropagationQueue, a plain list of vertices from a custom GAC_Initialize is turned into one
 def domainFiltering(queue, stateVertices, constraints, GAC_Revise):
+    if not isinstance(queue, PropagationQueue):
+        queue = PropagationQueue(len(stateVertices), queue)
     while len(queue) >= 1:
-        todoReviseVertex = queue.pop(0)
-        #queue.remove(todoReviseVertex)
+        todoReviseVertex = queue.popleft()
         for const in constraints[todoReviseVertex.index]:
             neighbour = stateVertices[const]
             change = GAC_Revise(constraints, todoReviseVertex,neighbour)
             if change:
                 for v in constraints[todoReviseVertex.index]:
-                    if stateVertices[v] not in queue:
-                        queue.append(stateVertices[v])
+                    queue.append(stateVertices[v])
 
 def inputConstraints():
     constraints = {}
@@ -0,0 +1,30 @@
+from collections import deque
+
+
+# Work list of the domain filtering, every vertex is in it at most once
+# A deque keeps the order and a flag per vertex index tells if the vertex is in it, so adding a vertex,
+# checking for it and taking the next one do not depend on the length of the queue
+class PropagationQueue:
+
+    def __init__(self, numberOfVertices, vertices=()):
+        self.vertices = deque()
+        self.queued = bytearray(numberOfVertices)
+        for vertex in vertices:
+            self.append(vertex)
+
+    # Does nothing if the vertex is already in the queue
+    def append(self, vertex):
+        if not self.queued[vertex.index]:
+            self.queued[vertex.index] = 1
+            self.vertices.append(vertex)
+
+    def popleft(self):
+        vertex = self.vertices.popleft()
+        self.queued[vertex.index] = 0
+        return vertex
+
+    def __contains__(self, vertex):
+        return self.queued[vertex.index] == 1
+
+    def __len__(self):
+        return len(self.vertices)
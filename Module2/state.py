@@ -26,6 +26,23 @@ class State:
         self.parent = None
 
 
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.key() == other.key()
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.key())
+
+    # Identifies the state, used by aStarAlgorithm to look up open and closed states
+    # Only the assumed values are used, the rest of the domains follow from them after the filtering
+    def key(self):
+        return tuple(str(vert.domain[0]) if vert.isAssumed() else None for vert in self.vertices)
+
     def getUniqeID(self):
         id = ""
         for vert in self.vertices: